@@ -0,0 +1,188 @@
+"""
+Checks download_data.py against a local stand-in HTTP server.
+
+Serves random bytes from a thread on 127.0.0.1 (with or without range
+support) and runs the downloader against it in a scratch directory:
+
+    range      parallel range download, hash recorded next to the file
+    resume     a rerun fetches only the ranges an interrupted run did not finish
+    truncated  a short .part without resume state is downloaded from scratch
+    mismatch   a wrong --sha256 raises, removes the .part and writes nothing
+    stale      an existing truncated file without a recorded hash is replaced
+    no-range   servers without range support fall back to a single stream
+
+Usage:
+    python data/check_download.py
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import download_data
+from download_data import DownloadError, download, main, read_checksum
+
+SIZE = 20 * 1024 * 1024 + 12345  # a few segments, not a multiple of the chunk size
+
+
+class StandInServer:
+    """Serves `payload` at /data.pt and counts the bytes it sent."""
+
+    def __init__(self, payload, ranges=True):
+        self.payload = payload
+        self.ranges = ranges
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                data = server.payload
+                match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+                if server.ranges and match:
+                    start = int(match.group(1))
+                    end = int(match.group(2)) if match.group(2) else len(data) - 1
+                    body = data[start:end + 1]
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+                else:
+                    body = data
+                    self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    return  # the probe stops reading after the first byte
+                with server.lock:
+                    server.bytes_sent += len(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/data.pt"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def reset(self):
+        self.bytes_sent = 0
+
+
+def check(name, condition):
+    print(f"{'✅' if condition else '❌'} {name}")
+    return condition
+
+
+def main_checks():
+    payload = os.urandom(SIZE)
+    digest = hashlib.sha256(payload).hexdigest()
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp, StandInServer(payload) as server:
+        output = os.path.join(tmp, "data.pt")
+        part = output + ".part"
+
+        def read_output():
+            with open(output, "rb") as f:
+                return f.read()
+
+        def clean():
+            for path in (output, part, part + ".json", output + ".sha256"):
+                if os.path.exists(path):
+                    os.remove(path)
+            server.reset()
+
+        # -----------------------------
+        # Parallel range download
+        # -----------------------------
+        got = download(server.url, output, sha256=digest, workers=4)
+        results.append(check(
+            "range: parallel download matches and its hash is recorded",
+            got == digest and read_output() == payload and read_checksum(output) == digest
+            and not os.path.exists(part + ".json")
+        ))
+
+        # -----------------------------
+        # Resume from saved progress: first half of every segment done
+        # -----------------------------
+        clean()
+        segments = download_data._split(SIZE, 4)
+        with open(part, "wb") as f:
+            f.truncate(SIZE)
+            for segment in segments:
+                start, end, _ = segment
+                segment[2] = (end + 1 - start) // 2
+                f.seek(start)
+                f.write(payload[start:start + segment[2]])
+        with open(part + ".json", "w") as f:
+            json.dump({"url": server.url, "size": SIZE, "segments": segments}, f)
+        done = sum(segment[2] for segment in segments)
+
+        download(server.url, output, sha256=digest, workers=4)
+        results.append(check(
+            f"resume: fetched only the missing {SIZE - done} bytes",
+            read_output() == payload and server.bytes_sent == SIZE - done + 1  # + probe byte
+        ))
+
+        # -----------------------------
+        # Truncated .part without resume state (e.g. the old downloader)
+        # -----------------------------
+        clean()
+        with open(part, "wb") as f:
+            f.write(payload[:SIZE // 3])
+        download(server.url, output, sha256=digest)
+        results.append(check("truncated: short .part is downloaded again", read_output() == payload))
+
+        # -----------------------------
+        # SHA-256 mismatch
+        # -----------------------------
+        clean()
+        try:
+            download(server.url, output, sha256="0" * 64)
+            raised = False
+        except DownloadError:
+            raised = True
+        results.append(check(
+            "mismatch: wrong hash raises and leaves neither file nor .part",
+            raised and not os.path.exists(output) and not os.path.exists(part)
+        ))
+
+        # -----------------------------
+        # Existing truncated file, no recorded hash, no pinned hash
+        # -----------------------------
+        clean()
+        with open(output, "wb") as f:
+            f.write(payload[:SIZE // 2])
+        first = main(["--url", server.url, "--output", output])
+        second = main(["--url", server.url, "--output", output])
+        results.append(check(
+            "stale: truncated file is replaced, then accepted by its recorded hash",
+            first == second == 0 and read_output() == payload and read_checksum(output) == digest
+        ))
+
+    # -----------------------------
+    # Server without range support
+    # -----------------------------
+    with tempfile.TemporaryDirectory() as tmp, StandInServer(payload, ranges=False) as server:
+        output = os.path.join(tmp, "data.pt")
+        got = download(server.url, output, sha256=digest)
+        results.append(check("no-range: single-stream fallback matches", got == digest))
+
+    print(f"\n{sum(results)}/{len(results)} checks passed")
+    return 0 if all(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main_checks())
@@ -1,40 +1,314 @@
+import argparse
+import hashlib
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 
 # -----------------------------
 # Settings
 # -----------------------------
-def main():
-    DATA_DIR = os.path.dirname(__file__)  # script folder = data/
-    DATA_FILE = "citeseer_challenge_public.pt"
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))  # script folder = data/
+DATA_FILE = "citeseer_challenge_public.pt"
+
+# Zenodo direct download link
+ZENODO_URL = (
+    "https://zenodo.org/record/18170986/files/citeseer_challenge_public.pt?download=1"
+)
+
+# SHA-256 of the published file. Every download prints the hash it computed
+# and records it next to the file (<file>.sha256), which later runs verify the
+# existing file against; pin it here (or pass --sha256) so a corrupted
+# download is rejected before it is ever renamed into place.
+DATA_SHA256 = None
+
+CHUNK_SIZE = 1024 * 1024            # 1 MiB reads
+SYNC_SIZE = 8 * 1024 * 1024         # fsync the .part file before recording progress
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024  # don't split files into tinier ranges
+DEFAULT_WORKERS = 4
+RETRIES = 3
+
+
+class DownloadError(Exception):
+    pass
+
+
+def sha256_of(path, chunk_size=CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def checksum_path(path):
+    return path + ".sha256"
+
+
+def read_checksum(path):
+    """SHA-256 recorded for `path` by a previous download, or None."""
+    try:
+        with open(checksum_path(path), "r") as f:
+            return f.read().split()[0].lower()
+    except (OSError, IndexError):
+        return None
+
+
+def write_checksum(path, digest):
+    """Record `digest` next to `path` in sha256sum format."""
+    tmp_path = checksum_path(path) + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(f"{digest}  {os.path.basename(path)}\n")
+    os.replace(tmp_path, checksum_path(path))
+
+
+# -----------------------------
+# Server probing
+# -----------------------------
+def probe(session, url, timeout):
+    """
+    Returns (size, supports_ranges). Asks for the first byte only, which also
+    works on servers that do not answer HEAD requests.
+    """
+    with session.get(url, headers={"Range": "bytes=0-0"}, stream=True,
+                     timeout=timeout, allow_redirects=True) as response:
+        if response.status_code == 206:
+            content_range = response.headers.get("Content-Range", "")
+            total = content_range.rpartition("/")[2]
+            if total.isdigit():
+                return int(total), True
+        if response.status_code in (200, 206):
+            length = response.headers.get("Content-Length")
+            return (int(length) if length and length.isdigit() else None), False
+        raise DownloadError(f"Failed to download, status code: {response.status_code}")
+
+
+# -----------------------------
+# Resumable segmented download
+# -----------------------------
+class _Progress:
+    """
+    Bytes completed per segment, persisted next to the .part file so an
+    interrupted download resumes where each segment stopped.
+    """
+
+    def __init__(self, state_path, url, size, segments):
+        self.state_path = state_path
+        self.url = url
+        self.size = size
+        self.segments = segments  # [[start, end_inclusive, done], ...]
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, state_path, url, size):
+        try:
+            with open(state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("url") != url or state.get("size") != size:
+            return None
+        return cls(state_path, url, size, state["segments"])
+
+    def advance(self, index, nbytes):
+        with self.lock:
+            self.segments[index][2] += nbytes
+            self.save()
+
+    def save(self):
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"url": self.url, "size": self.size, "segments": self.segments}, f)
+        os.replace(tmp_path, self.state_path)
+
+
+def _split(size, workers):
+    count = max(1, min(workers, size // MIN_SEGMENT_SIZE))
+    bounds = [size * i // count for i in range(count + 1)]
+    return [[bounds[i], bounds[i + 1] - 1, 0] for i in range(count)]
 
-    # Zenodo direct download link
-    ZENODO_URL = (
-        "https://zenodo.org/record/18170986/files/citeseer_challenge_public.pt?download=1"
-    )
 
-    output_path = os.path.join(DATA_DIR, DATA_FILE)
+def _sync(f):
+    """
+    Make written bytes durable before the resume state counts them, so a
+    crash never leaves the state claiming data the .part file lacks.
+    """
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _fetch_segment(session, url, part_path, progress, index, chunk_size, timeout):
+    for attempt in range(RETRIES + 1):
+        start, end, done = progress.segments[index]
+        if start + done > end:
+            return
+        try:
+            headers = {"Range": f"bytes={start + done}-{end}"}
+            with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+                if response.status_code != 206:
+                    raise DownloadError(
+                        f"Range request failed, status code: {response.status_code}"
+                    )
+                with open(part_path, "r+b") as f:
+                    f.seek(start + done)
+                    unsynced = 0
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        chunk = chunk[:end + 1 - f.tell()]
+                        f.write(chunk)
+                        unsynced += len(chunk)
+                        if unsynced >= SYNC_SIZE:
+                            _sync(f)
+                            progress.advance(index, unsynced)
+                            unsynced = 0
+                    if unsynced:
+                        _sync(f)
+                        progress.advance(index, unsynced)
+            if start + progress.segments[index][2] > end:
+                return
+        except (requests.RequestException, DownloadError):
+            if attempt == RETRIES:
+                raise
+        time.sleep(2 ** attempt)
+    raise DownloadError(f"Segment {index} incomplete after {RETRIES} retries")
+
+
+def _download_ranges(session, url, part_path, size, workers, chunk_size, timeout):
+    state_path = part_path + ".json"
+    progress = None
+    if os.path.exists(part_path) and os.path.getsize(part_path) == size:
+        progress = _Progress.load(state_path, url, size)
+
+    if progress is None:
+        progress = _Progress(state_path, url, size, _split(size, workers))
+        with open(part_path, "wb") as f:
+            f.truncate(size)
+        progress.save()
+    else:
+        done = sum(segment[2] for segment in progress.segments)
+        print(f"Resuming download at {done / size:.0%} ({done}/{size} bytes)")
+
+    with ThreadPoolExecutor(max_workers=len(progress.segments)) as pool:
+        futures = [
+            pool.submit(_fetch_segment, session, url, part_path, progress, i, chunk_size, timeout)
+            for i in range(len(progress.segments))
+        ]
+        for future in futures:
+            future.result()
+
+    os.remove(state_path)
+
+
+def _download_stream(session, url, part_path, chunk_size, timeout):
+    """Plain single-stream download for servers without range support."""
+    with session.get(url, stream=True, timeout=timeout) as response:
+        if response.status_code != 200:
+            raise DownloadError(f"Failed to download, status code: {response.status_code}")
+        with open(part_path, "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+
+
+def download(url, output_path, sha256=None, workers=DEFAULT_WORKERS,
+             chunk_size=CHUNK_SIZE, timeout=60, session=None):
+    """
+    Download `url` to `output_path`.
+
+    Data goes to `<output_path>.part` and is renamed into place only after
+    the size (and `sha256`, if given) check out, so an interrupted download
+    never leaves a truncated file at `output_path`. If the server supports
+    range requests the file is fetched in up to `workers` parallel ranges,
+    and a rerun resumes each range from where it stopped.
+    """
+    session = session or requests.Session()
+    part_path = output_path + ".part"
+
+    size, supports_ranges = probe(session, url, timeout)
+
+    if supports_ranges and size:
+        _download_ranges(session, url, part_path, size, workers, chunk_size, timeout)
+    else:
+        _download_stream(session, url, part_path, chunk_size, timeout)
+
+    if size is not None and os.path.getsize(part_path) != size:
+        raise DownloadError(
+            f"Downloaded {os.path.getsize(part_path)} bytes, expected {size}"
+        )
+
+    digest = sha256_of(part_path, chunk_size)
+    if sha256 and digest != sha256.lower():
+        os.remove(part_path)
+        raise DownloadError(f"SHA-256 mismatch: got {digest}, expected {sha256}")
+
+    os.replace(part_path, output_path)
+    write_checksum(output_path, digest)
+    return digest
+
+
+def verify_existing(path, url, sha256=None, timeout=60, session=None):
+    """
+    None if the file at `path` is complete, else why it is not. It is checked
+    against `sha256`, else the hash recorded by the download that wrote it.
+    A file without either (e.g. left by an older downloader) must at least
+    have the size the server reports; its hash is then recorded.
+    """
+    expected = sha256.lower() if sha256 else read_checksum(path)
+    if expected:
+        if sha256_of(path) != expected:
+            return "failed SHA-256 verification"
+        return None
+
+    try:
+        size, _ = probe(session or requests.Session(), url, timeout)
+    except (requests.RequestException, DownloadError) as e:
+        print(f"Could not verify the size of {path} ({e}), assuming it is complete")
+        return None
+    if size is not None and os.path.getsize(path) != size:
+        return f"is incomplete ({os.path.getsize(path)} of {size} bytes)"
+    write_checksum(path, sha256_of(path))
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Download the public challenge data")
+    parser.add_argument("--url", default=ZENODO_URL)
+    parser.add_argument("--output", default=os.path.join(DATA_DIR, DATA_FILE))
+    parser.add_argument("--sha256", default=DATA_SHA256,
+                        help="Expected SHA-256 of the file (default: pinned value)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Parallel range requests")
+    args = parser.parse_args(argv)
+
+    output_path = args.output
 
     # -----------------------------
     # Create folder if it doesn't exist
     # -----------------------------
-    os.makedirs(DATA_DIR, exist_ok=True)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
 
     # -----------------------------
-    # Download if not exists
+    # Download if not exists (or if it fails verification)
     # -----------------------------
     if os.path.exists(output_path):
-        print(f"Data already exists at {output_path}")
-    else:
-        print(f"Downloading {DATA_FILE} from Zenodo...")
-        response = requests.get(ZENODO_URL, stream=True)
-        if response.status_code == 200:
-            with open(output_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            print("Download completed!")
-        else:
-            print(f"Failed to download, status code: {response.status_code}")
+        problem = verify_existing(output_path, args.url, args.sha256)
+        if problem is None:
+            print(f"Data already exists at {output_path}")
+            return 0
+        print(f"Existing {output_path} {problem}, downloading again")
+
+    print(f"Downloading {os.path.basename(output_path)} from {args.url}...")
+    try:
+        digest = download(args.url, output_path, sha256=args.sha256, workers=args.workers)
+    except (requests.RequestException, DownloadError) as e:
+        print(f"Download failed: {e}")
+        if os.path.exists(output_path + ".part"):
+            print("Run the script again to resume.")
+        return 1
+
+    print(f"Download completed! SHA-256: {digest}")
+    return 0
 
 if __name__ == '__main__':
-    main()
+    raise SystemExit(main())
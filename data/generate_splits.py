@@ -0,0 +1,299 @@
+"""
+Generate hard challenge splits (train/val/test_mask_challange) with
+controlled distribution shift, for robustness testing and future rounds.
+
+Strategies:
+    cluster   - partition the graph into BFS-grown clusters around random
+                seeds and hold out whole clusters as the test set
+    degree    - train on well connected nodes, test on the least connected
+    distance  - test on the nodes farthest (in hops) from the training nodes
+
+All graph work is vectorized over a scipy CSR adjacency: a multi-source BFS
+expands a whole frontier per step, so each split costs O(E) numpy work and
+dozens of candidates take seconds even on large graphs.
+
+Each candidate is saved as <strategy>-<seed>.npz (same mask names as the
+public data) plus <strategy>-<seed>.env holding PRIVATE_TEST_MASK_CHALLENGE
+in the base64 format the scorer expects.
+
+Usage:
+    python data/generate_splits.py --graph data/synthetic --out data/splits \\
+        --strategy cluster degree distance --candidates 10
+"""
+import argparse
+import base64
+import json
+import os
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+TRAIN_PER_CLASS = 20
+VAL_SIZE = 500
+TEST_SIZE = 1000
+CLUSTER_SIZE = 200  # average nodes per BFS cluster
+
+MASK_NAMES = ["train_mask_challange", "val_mask_challange", "test_mask_challange"]
+
+
+# -----------------------------
+# Graph primitives
+# -----------------------------
+def load_graph(path):
+    """
+    (edge_index, y) from a generate_synthetic.py output directory or a
+    public-format .pt file. Nodes with y < 0 have hidden labels.
+    """
+    if os.path.isdir(path):
+        return np.load(os.path.join(path, "edge_index.npy")), np.load(os.path.join(path, "y.npy"))
+
+    import torch
+    data = torch.load(path, weights_only=False)
+    if isinstance(data, (list, tuple)):
+        data = data[0]
+    return data.edge_index.cpu().numpy(), data.y.cpu().numpy()
+
+
+def adjacency(edge_index, num_nodes):
+    """Symmetric boolean CSR adjacency without self loops."""
+    src, dst = edge_index
+    keep = src != dst
+    src, dst = src[keep], dst[keep]
+    adj = sp.csr_matrix(
+        (np.ones(2 * len(src), dtype=np.bool_), (np.concatenate([src, dst]), np.concatenate([dst, src]))),
+        shape=(num_nodes, num_nodes)
+    )
+    adj.sum_duplicates()
+    return adj
+
+
+def multi_source_bfs(adj, sources):
+    """
+    Hop distance from the nearest source and the id of that source for every
+    node (-1 where unreachable). One vectorized expansion per BFS level.
+    """
+    num_nodes = adj.shape[0]
+    dist = np.full(num_nodes, -1, dtype=np.int32)
+    nearest = np.full(num_nodes, -1, dtype=np.int64)
+
+    frontier = np.unique(np.asarray(sources, dtype=np.int64))
+    dist[frontier] = 0
+    nearest[frontier] = frontier
+
+    depth = 0
+    while frontier.size:
+        depth += 1
+        rows = adj[frontier]
+        neighbors = rows.indices
+        owners = np.repeat(frontier, np.diff(rows.indptr))
+
+        new = dist[neighbors] < 0
+        neighbors, first = np.unique(neighbors[new], return_index=True)
+        dist[neighbors] = depth
+        nearest[neighbors] = nearest[owners[new][first]]
+        frontier = neighbors
+
+    return dist, nearest
+
+
+def bfs_clusters(adj, num_clusters, rng):
+    """
+    Partition nodes into graph-Voronoi cells around random seeds (each node
+    joins its nearest seed). Nodes unreachable from every seed form one
+    extra cluster.
+    """
+    num_nodes = adj.shape[0]
+    seeds = rng.choice(num_nodes, min(num_clusters, num_nodes), replace=False)
+    _, nearest = multi_source_bfs(adj, seeds)
+
+    cluster = np.full(num_nodes, len(seeds), dtype=np.int64)
+    reached = nearest >= 0
+    seed_index = np.empty(num_nodes, dtype=np.int64)
+    seed_index[seeds] = np.arange(len(seeds))
+    cluster[reached] = seed_index[nearest[reached]]
+    return cluster
+
+
+# -----------------------------
+# Sampling helpers
+# -----------------------------
+def sample_per_class(candidates, y, per_class, rng):
+    """Up to `per_class` random candidates of every class."""
+    candidates = candidates[rng.permutation(len(candidates))]
+    chosen = [candidates[y[candidates] == c][:per_class] for c in np.unique(y[candidates])]
+    return np.concatenate(chosen) if chosen else np.empty(0, dtype=np.int64)
+
+
+def to_masks(num_nodes, train, val, test):
+    masks = {}
+    for name, index in zip(MASK_NAMES, (train, val, test)):
+        mask = np.zeros(num_nodes, dtype=np.bool_)
+        mask[index] = True
+        masks[name] = mask
+    return masks
+
+
+# -----------------------------
+# Strategies
+# -----------------------------
+def cluster_split(adj, y, rng, train_per_class=TRAIN_PER_CLASS,
+                  val_size=VAL_SIZE, test_size=TEST_SIZE, cluster_size=CLUSTER_SIZE):
+    """Hold out whole BFS clusters as the test set."""
+    labeled = y >= 0
+    cluster = bfs_clusters(adj, max(2, adj.shape[0] // cluster_size), rng)
+
+    # Add clusters in random order until they hold enough labeled nodes
+    counts = np.bincount(cluster, weights=labeled, minlength=cluster.max() + 1)
+    order = rng.permutation(len(counts))
+    needed = np.searchsorted(np.cumsum(counts[order]), test_size) + 1
+    held_out = np.isin(cluster, order[:needed]) & labeled
+
+    test = np.flatnonzero(held_out)
+    test = test[rng.permutation(len(test))[:test_size]]
+
+    rest = np.flatnonzero(labeled & ~np.isin(cluster, order[:needed]))
+    train = sample_per_class(rest, y, train_per_class, rng)
+    rest = np.setdiff1d(rest, train)
+    val = rest[rng.permutation(len(rest))[:val_size]]
+    return train, val, test
+
+
+def degree_split(adj, y, rng, train_per_class=TRAIN_PER_CLASS,
+                 val_size=VAL_SIZE, test_size=TEST_SIZE):
+    """Train/val from the better connected half, test from the least connected nodes."""
+    labeled = np.flatnonzero(y >= 0)
+    degree = np.diff(adj.indptr)[labeled]
+
+    # Random tie-break within equal degrees
+    by_degree = labeled[np.lexsort((rng.random(len(labeled)), degree))]
+    test = by_degree[:test_size]
+
+    head = by_degree[len(by_degree) // 2:]
+    head = head[~np.isin(head, test)]
+    train = sample_per_class(head, y, train_per_class, rng)
+    rest = np.setdiff1d(head, train)
+    val = rest[rng.permutation(len(rest))[:val_size]]
+    return train, val, test
+
+
+def distance_split(adj, y, rng, train_per_class=TRAIN_PER_CLASS,
+                   val_size=VAL_SIZE, test_size=TEST_SIZE):
+    """Test on the labeled nodes farthest from the training nodes (unreachable first)."""
+    labeled = np.flatnonzero(y >= 0)
+    train = sample_per_class(labeled, y, train_per_class, rng)
+
+    dist, _ = multi_source_bfs(adj, train)
+    rest = np.setdiff1d(labeled, train)
+    far = np.where(dist[rest] < 0, np.iinfo(np.int32).max, dist[rest])
+    by_distance = rest[np.lexsort((rng.random(len(rest)), -far))]
+
+    test = by_distance[:test_size]
+    remaining = by_distance[test_size:]
+    val = remaining[rng.permutation(len(remaining))[:val_size]]
+    return train, val, test
+
+
+SPLITS = {
+    "cluster": cluster_split,
+    "degree": degree_split,
+    "distance": distance_split,
+}
+
+
+def make_split(strategy, edge_index, y, seed=0, **sizes):
+    """Masks {train,val,test}_mask_challange for one strategy and seed."""
+    rng = np.random.default_rng(seed)
+    adj = adjacency(edge_index, len(y))
+    return to_masks(len(y), *SPLITS[strategy](adj, y, rng, **sizes))
+
+
+# -----------------------------
+# Diagnostics and export
+# -----------------------------
+def split_stats(adj, y, masks):
+    """How far the test set is shifted from the training set."""
+    train = np.flatnonzero(masks["train_mask_challange"])
+    test = masks["test_mask_challange"]
+    dist, _ = multi_source_bfs(adj, train)
+    degree = np.diff(adj.indptr)
+
+    test_dist = dist[test]
+    reachable = test_dist >= 0
+    classes = int(y.max()) + 1
+    train_classes = np.bincount(y[train], minlength=classes) / max(len(train), 1)
+    test_classes = np.bincount(y[test], minlength=classes) / max(int(test.sum()), 1)
+
+    return {
+        "train": len(train),
+        "val": int(masks["val_mask_challange"].sum()),
+        "test": int(test.sum()),
+        "test_unreachable_fraction": float(1 - reachable.mean()) if len(test_dist) else None,
+        "test_mean_hops_to_train": float(test_dist[reachable].mean()) if reachable.any() else None,
+        "train_mean_degree": float(degree[train].mean()) if len(train) else None,
+        "test_mean_degree": float(degree[test].mean()) if test.any() else None,
+        "class_shift_tv": float(0.5 * np.abs(train_classes - test_classes).sum()),
+    }
+
+
+def mask_secret(mask):
+    """base64 of the boolean mask bytes, the format of PRIVATE_TEST_MASK_CHALLENGE."""
+    return base64.b64encode(np.asarray(mask, dtype=np.bool_).tobytes()).decode()
+
+
+def save_split(masks, out_dir, name):
+    np.savez(os.path.join(out_dir, f"{name}.npz"), **masks)
+    with open(os.path.join(out_dir, f"{name}.env"), "w") as f:
+        f.write(f"PRIVATE_TEST_MASK_CHALLENGE={mask_secret(masks['test_mask_challange'])}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate candidate challenge splits")
+    parser.add_argument("--graph", required=True,
+                        help="generate_synthetic.py output directory or a .pt file with full labels")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--strategy", nargs="+", choices=sorted(SPLITS), default=sorted(SPLITS))
+    parser.add_argument("--candidates", type=int, default=1, help="Splits per strategy")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first candidate")
+    parser.add_argument("--train-per-class", type=int, default=TRAIN_PER_CLASS)
+    parser.add_argument("--val-size", type=int, default=VAL_SIZE)
+    parser.add_argument("--test-size", type=int, default=TEST_SIZE)
+    args = parser.parse_args()
+
+    edge_index, y = load_graph(args.graph)
+    adj = adjacency(edge_index, len(y))
+    os.makedirs(args.out, exist_ok=True)
+    sizes = dict(train_per_class=args.train_per_class, val_size=args.val_size,
+                 test_size=args.test_size)
+
+    summary = {}
+    print(f"{'split':<16}{'train':>7}{'val':>7}{'test':>7}{'hops':>7}"
+          f"{'unreach':>9}{'deg tr':>8}{'deg te':>8}{'class tv':>10}{'sec':>7}")
+    for strategy in args.strategy:
+        for seed in range(args.seed, args.seed + args.candidates):
+            start = time.perf_counter()
+            rng = np.random.default_rng(seed)
+            masks = to_masks(len(y), *SPLITS[strategy](adj, y, rng, **sizes))
+            seconds = time.perf_counter() - start
+
+            name = f"{strategy}-{seed}"
+            save_split(masks, args.out, name)
+            stats = split_stats(adj, y, masks)
+            summary[name] = dict(stats, seconds=seconds)
+
+            def fmt(value, spec):
+                return format(value, spec) if value is not None else "-"
+
+            print(f"{name:<16}{stats['train']:>7}{stats['val']:>7}{stats['test']:>7}"
+                  f"{fmt(stats['test_mean_hops_to_train'], '>7.2f')}"
+                  f"{fmt(stats['test_unreachable_fraction'], '>9.2%')}"
+                  f"{fmt(stats['train_mean_degree'], '>8.2f')}{fmt(stats['test_mean_degree'], '>8.2f')}"
+                  f"{stats['class_shift_tv']:>10.3f}{seconds:>7.2f}")
+
+    with open(os.path.join(args.out, "summary.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"\nSaved {len(summary)} split(s) to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,383 @@
+"""
+Synthetic CiteSeer-like graphs for stress-testing baseline.py, the scorer and
+the submission pipeline at larger scale.
+
+The generated graph has the same schema as citeseer_challenge_public.pt
+(x, edge_index, y, train/val/test_mask and the *_mask_challange masks) and
+matches CiteSeer's statistics at any size:
+
+- power-law degree distribution with ~1.4% isolated nodes, average degree 2.74
+- 6 classes with CiteSeer's class proportions and edge homophily ~0.74
+- sparse binary bag-of-words features over 3,703 words, ~32 words per node,
+  drawn from class-specific word distributions
+
+Generation is vectorized and streamed: edges are sampled in chunks
+(degree-weighted Chung-Lu with a same-class bias) and features are written
+chunk by chunk as CSR arrays, so a 1M-node graph needs well under 1 GB of RAM.
+
+Usage:
+    python data/generate_synthetic.py --nodes 1000000 --out data/synthetic_1m
+    python data/generate_synthetic.py --nodes 3327 --out data/synthetic \\
+        --pt data/synthetic.pt --secrets data/synthetic_secrets.env
+"""
+import argparse
+import base64
+import json
+import os
+
+import numpy as np
+
+from generate_splits import SPLITS, adjacency, to_masks
+
+# -----------------------------
+# CiteSeer statistics
+# -----------------------------
+CITESEER_NODES = 3327
+NUM_FEATURES = 3703
+CLASS_PROPORTIONS = np.array([264, 590, 668, 701, 596, 508]) / CITESEER_NODES
+AVG_DEGREE = 2.74            # 9,104 directed edges / 3,327 nodes
+ISOLATED_FRACTION = 0.0144   # 48 isolated nodes
+DEGREE_EXPONENT = 2.6
+MAX_DEGREE_FRACTION = 0.03   # max degree 99 of 3,327 nodes
+EDGE_HOMOPHILY = 0.74
+WORDS_PER_NODE = 31.7
+WORD_OVERSAMPLING = 1.12     # words are drawn with replacement; ~11% are repeats
+CLASS_WORD_FRACTION = 0.1    # share of the vocabulary specific to each class
+CLASS_WORD_WEIGHT = 0.5      # probability a word is drawn from the class vocabulary
+
+# Original split sizes: 20 train nodes per class, 500 val, 1000 test
+TRAIN_PER_CLASS = 20
+VAL_SIZE = 500
+TEST_SIZE = 1000
+
+CHUNK_NODES = 1 << 16
+CHUNK_EDGES = 1 << 20
+
+MASK_NAMES = [
+    "train_mask", "val_mask", "test_mask",
+    "train_mask_challange", "val_mask_challange", "test_mask_challange",
+]
+
+
+# -----------------------------
+# Structure
+# -----------------------------
+def sample_degree_weights(num_nodes, rng, avg_degree=AVG_DEGREE):
+    """Power-law expected degrees with a fraction of isolated nodes."""
+    u = rng.random(num_nodes)
+    weights = (1.0 - u) ** (-1.0 / (DEGREE_EXPONENT - 1.0))
+    weights = np.minimum(weights, max(MAX_DEGREE_FRACTION * num_nodes, 10.0))
+    weights[rng.random(num_nodes) < ISOLATED_FRACTION] = 0.0
+    return weights * (avg_degree * num_nodes / weights.sum())
+
+
+def sample_edges(y, weights, rng, num_classes, homophily=EDGE_HOMOPHILY,
+                 chunk_edges=CHUNK_EDGES):
+    """
+    Undirected edges with expected degrees ~ `weights` and edge homophily
+    ~ `homophily`. Yields (src, dst) chunks; duplicates are removed later.
+
+    Every node with non-zero weight first gets one edge of its own, so only
+    the intended fraction of nodes ends up isolated; the remaining edges are
+    sampled with both endpoints proportional to `weights`.
+    """
+    num_edges = int(round(weights.sum() / 2))
+    anchored = np.flatnonzero(weights > 0)
+
+    # Cumulative degree weights with nodes grouped by class, so "any node" and
+    # "a node of class c" are both one searchsorted over the same array.
+    order = np.argsort(y, kind="stable")
+    cumulative = np.cumsum(weights[order])
+    total = cumulative[-1]
+    boundaries = np.searchsorted(y[order], np.arange(num_classes + 1), side="left")
+    class_mass = np.concatenate([[0.0], cumulative])[boundaries]
+    class_start, class_end = class_mass[:-1], class_mass[1:]
+
+    # A degree-weighted random target already has the source's class with
+    # probability sum_c share_c^2; bias the rest to reach the target homophily.
+    share = (class_end - class_start) / total
+    baseline = float((share ** 2).sum())
+    same_class = max(0.0, (homophily - baseline) / (1.0 - baseline))
+
+    def pick(low, high):
+        u = low + rng.random(len(low)) * (high - low)
+        return order[np.minimum(np.searchsorted(cumulative, u, side="right"), len(order) - 1)]
+
+    def sources():
+        for start in range(0, len(anchored), chunk_edges):
+            yield anchored[start:start + chunk_edges]
+        remaining = max(num_edges - len(anchored), 0)
+        for start in range(0, remaining, chunk_edges):
+            count = min(chunk_edges, remaining - start)
+            yield pick(np.zeros(count), np.full(count, total))
+
+    for src in sources():
+        count = len(src)
+        c = y[src]
+        biased = rng.random(count) < same_class
+        low = np.where(biased, class_start[c], 0.0)
+        high = np.where(biased, class_end[c], total)
+        dst = pick(low, high)
+
+        keep = src != dst
+        yield src[keep], dst[keep]
+
+
+def build_edge_index(num_nodes, edge_chunks):
+    """Deduplicated, symmetric edge_index (2 x E, sorted by source)."""
+    keys = []
+    for src, dst in edge_chunks:
+        low, high = np.minimum(src, dst), np.maximum(src, dst)
+        keys.append(np.unique(low.astype(np.int64) * num_nodes + high))
+    keys = np.unique(np.concatenate(keys)) if keys else np.empty(0, dtype=np.int64)
+
+    low, high = keys // num_nodes, keys % num_nodes
+    src = np.concatenate([low, high])
+    dst = np.concatenate([high, low])
+    order = np.lexsort((dst, src))
+    return np.stack([src[order], dst[order]])
+
+
+# -----------------------------
+# Features
+# -----------------------------
+def word_distributions(num_classes, num_features, rng):
+    """Cumulative word distribution per class: Zipf background + class vocabulary."""
+    background = 1.0 / np.arange(1, num_features + 1) ** 1.1
+    background = background[rng.permutation(num_features)]
+    background /= background.sum()
+
+    class_words = max(1, int(CLASS_WORD_FRACTION * num_features))
+    cumulative = np.empty((num_classes, num_features))
+    for c in range(num_classes):
+        specific = np.zeros(num_features)
+        specific[rng.choice(num_features, class_words, replace=False)] = 1.0 / class_words
+        cumulative[c] = np.cumsum((1 - CLASS_WORD_WEIGHT) * background + CLASS_WORD_WEIGHT * specific)
+    cumulative[:, -1] = 1.0
+    return cumulative
+
+
+def sample_feature_chunk(y_chunk, cumulative, rng):
+    """CSR (indptr, indices) of binary features for one chunk of nodes."""
+    num_features = cumulative.shape[1]
+    counts = np.maximum(rng.poisson(WORDS_PER_NODE * WORD_OVERSAMPLING, len(y_chunk)), 1)
+    rows = np.repeat(np.arange(len(y_chunk)), counts)
+
+    # Inverse-CDF sampling, offset per class so one searchsorted covers all
+    u = rng.random(len(rows))
+    classes = y_chunk[rows]
+    flat = (cumulative + np.arange(len(cumulative))[:, None]).ravel()
+    words = np.searchsorted(flat, u + classes, side="right") - classes * num_features
+    words = np.clip(words, 0, num_features - 1)
+
+    keys = np.unique(rows.astype(np.int64) * num_features + words)
+    rows, indices = keys // num_features, keys % num_features
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(y_chunk)))])
+    return indptr, indices.astype(np.int32)
+
+
+# -----------------------------
+# Masks
+# -----------------------------
+def original_masks(y, num_classes, rng):
+    """CiteSeer-style split: 20 train nodes per class, then val and test."""
+    num_nodes = len(y)
+    scale = num_nodes / CITESEER_NODES
+    order = rng.permutation(num_nodes)
+
+    train = np.zeros(num_nodes, dtype=np.bool_)
+    for c in range(num_classes):
+        train[order[y[order] == c][:TRAIN_PER_CLASS]] = True
+    rest = order[~train[order]]
+
+    val = np.zeros(num_nodes, dtype=np.bool_)
+    test = np.zeros(num_nodes, dtype=np.bool_)
+    val_size, test_size = int(VAL_SIZE * scale), int(TEST_SIZE * scale)
+    val[rest[:val_size]] = True
+    test[rest[val_size:val_size + test_size]] = True
+    return train, val, test
+
+
+def challenge_masks(y, edge_index, rng, strategy="degree"):
+    """Distribution-shifted split from generate_splits.py (see SPLITS)."""
+    scale = len(y) / CITESEER_NODES
+    adj = adjacency(edge_index, len(y))
+    split = SPLITS[strategy](adj, y, rng, train_per_class=TRAIN_PER_CLASS,
+                             val_size=int(VAL_SIZE * scale), test_size=int(TEST_SIZE * scale))
+    return tuple(to_masks(len(y), *split).values())
+
+
+# -----------------------------
+# Generation
+# -----------------------------
+def generate(num_nodes, out_dir, num_classes=len(CLASS_PROPORTIONS),
+             num_features=NUM_FEATURES, avg_degree=AVG_DEGREE,
+             homophily=EDGE_HOMOPHILY, seed=0, chunk_nodes=CHUNK_NODES, split="degree"):
+    """
+    Generate a graph into `out_dir`, with challenge masks from the `split`
+    strategy of generate_splits.py:
+
+        meta.json                      sizes and generation parameters
+        y.npy, edge_index.npy, masks.npz
+        features_indptr.npy            CSR row pointers (num_nodes + 1)
+        features_indices.bin           CSR column indices (int32), streamed
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+
+    proportions = CLASS_PROPORTIONS if num_classes == len(CLASS_PROPORTIONS) \
+        else np.full(num_classes, 1.0 / num_classes)
+    y = rng.choice(num_classes, num_nodes, p=proportions).astype(np.int64)
+
+    # Structure
+    weights = sample_degree_weights(num_nodes, rng, avg_degree)
+    edge_index = build_edge_index(
+        num_nodes, sample_edges(y, weights, rng, num_classes, homophily)
+    )
+    np.save(os.path.join(out_dir, "edge_index.npy"), edge_index)
+    degree = np.bincount(edge_index[0], minlength=num_nodes)
+    del weights
+
+    # Features, streamed chunk by chunk
+    cumulative = word_distributions(num_classes, num_features, rng)
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    with open(os.path.join(out_dir, "features_indices.bin"), "wb") as f:
+        for start in range(0, num_nodes, chunk_nodes):
+            stop = min(start + chunk_nodes, num_nodes)
+            chunk_indptr, chunk_indices = sample_feature_chunk(y[start:stop], cumulative, rng)
+            indptr[start + 1:stop + 1] = indptr[start] + chunk_indptr[1:]
+            f.write(chunk_indices.tobytes())
+    np.save(os.path.join(out_dir, "features_indptr.npy"), indptr)
+
+    # Labels and masks
+    np.save(os.path.join(out_dir, "y.npy"), y)
+    masks = original_masks(y, num_classes, rng) + challenge_masks(y, edge_index, rng, split)
+    np.savez(os.path.join(out_dir, "masks.npz"), **dict(zip(MASK_NAMES, masks)))
+
+    meta = {
+        "num_nodes": num_nodes,
+        "num_edges": int(edge_index.shape[1]),
+        "num_features": num_features,
+        "num_classes": num_classes,
+        "feature_nnz": int(indptr[-1]),
+        "avg_degree": float(edge_index.shape[1] / num_nodes),
+        "edge_homophily": float((y[edge_index[0]] == y[edge_index[1]]).mean())
+        if edge_index.shape[1] else None,
+        "isolated_nodes": int((degree == 0).sum()),
+        "seed": seed,
+        "split": split,
+    }
+    with open(os.path.join(out_dir, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+# -----------------------------
+# Loading / export
+# -----------------------------
+def load_features(out_dir):
+    """CSR feature arrays (indptr, memory-mapped indices)."""
+    indptr = np.load(os.path.join(out_dir, "features_indptr.npy"))
+    indices = np.memmap(os.path.join(out_dir, "features_indices.bin"), dtype=np.int32, mode="r")
+    return indptr, indices
+
+
+def load_synthetic(out_dir, dense=None, hide_test_labels=False):
+    """
+    Load a generated graph as a torch_geometric Data object.
+
+    `x` is a dense float tensor when it fits in 2 GiB (or `dense=True`),
+    otherwise a torch sparse CSR tensor. With `hide_test_labels` the labels of
+    test_mask_challange nodes are set to -1, as in the public dataset.
+    """
+    import torch
+    from torch_geometric.data import Data
+
+    with open(os.path.join(out_dir, "meta.json"), "r") as f:
+        meta = json.load(f)
+    num_nodes, num_features = meta["num_nodes"], meta["num_features"]
+
+    indptr, indices = load_features(out_dir)
+    if dense is None:
+        dense = num_nodes * num_features * 4 <= 2 * 1024 ** 3
+
+    if dense:
+        x = torch.zeros(num_nodes, num_features)
+        rows = np.repeat(np.arange(num_nodes), np.diff(indptr))
+        x[torch.from_numpy(rows), torch.from_numpy(np.asarray(indices, dtype=np.int64))] = 1.0
+    else:
+        x = torch.sparse_csr_tensor(
+            torch.from_numpy(indptr),
+            torch.from_numpy(np.asarray(indices, dtype=np.int64)),
+            torch.ones(len(indices)),
+            size=(num_nodes, num_features)
+        )
+
+    y = torch.from_numpy(np.load(os.path.join(out_dir, "y.npy")))
+    masks = np.load(os.path.join(out_dir, "masks.npz"))
+    data = Data(
+        x=x,
+        edge_index=torch.from_numpy(np.load(os.path.join(out_dir, "edge_index.npy"))),
+        y=y.clone(),
+        **{name: torch.from_numpy(masks[name]) for name in MASK_NAMES}
+    )
+    if hide_test_labels:
+        data.y[data.test_mask_challange] = -1
+    return data
+
+
+def export_secrets(out_dir):
+    """
+    The scorer's secrets (PRIVATE_Y, PRIVATE_TEST_MASK_CHALLENGE,
+    PRIVATE_TEST_MASK) for a generated graph, base64-encoded like the
+    GitHub secrets.
+    """
+    y = np.load(os.path.join(out_dir, "y.npy"))
+    masks = np.load(os.path.join(out_dir, "masks.npz"))
+    return {
+        "PRIVATE_Y": base64.b64encode(y.astype(np.int64).tobytes()).decode(),
+        "PRIVATE_TEST_MASK_CHALLENGE": base64.b64encode(
+            masks["test_mask_challange"].astype(np.bool_).tobytes()).decode(),
+        "PRIVATE_TEST_MASK": base64.b64encode(
+            masks["test_mask"].astype(np.bool_).tobytes()).decode(),
+    }
+
+
+def write_secrets(secrets, path):
+    """Write secrets as a .env file (usable with python-dotenv or `source`)."""
+    with open(path, "w") as f:
+        for name, value in secrets.items():
+            f.write(f"{name}={value}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic CiteSeer-like graph")
+    parser.add_argument("--nodes", type=int, default=CITESEER_NODES)
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--classes", type=int, default=len(CLASS_PROPORTIONS))
+    parser.add_argument("--features", type=int, default=NUM_FEATURES)
+    parser.add_argument("--avg-degree", type=float, default=AVG_DEGREE)
+    parser.add_argument("--homophily", type=float, default=EDGE_HOMOPHILY)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--split", choices=sorted(SPLITS), default="degree",
+                        help="Challenge split strategy (see generate_splits.py)")
+    parser.add_argument("--pt", help="Also save a public-format .pt file ([Data], hidden test labels)")
+    parser.add_argument("--secrets", help="Also write the scorer secrets to this .env file")
+    args = parser.parse_args()
+
+    meta = generate(args.nodes, args.out, args.classes, args.features,
+                    args.avg_degree, args.homophily, args.seed, split=args.split)
+    print(json.dumps(meta, indent=2))
+
+    if args.pt:
+        import torch
+        torch.save([load_synthetic(args.out, hide_test_labels=True)], args.pt)
+        print(f"Saved {args.pt}")
+
+    if args.secrets:
+        write_secrets(export_secrets(args.out), args.secrets)
+        print(f"Saved {args.secrets}")
+
+
+if __name__ == '__main__':
+    main()
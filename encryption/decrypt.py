@@ -7,7 +7,10 @@ from cryptography.fernet import Fernet
 
 load_dotenv()
 
-def decrypt_file_content(encrypted_file_path):
+RSA_SEGMENT_SIZE = 256
+
+
+def load_private_key():
     private_key_pem = os.environ.get("SUBMISSION_PRIVATE_KEY")
     
     if not private_key_pem:
@@ -20,7 +23,7 @@ def decrypt_file_content(encrypted_file_path):
     private_key_pem = private_key_pem.strip()
 
     try:
-        private_key = serialization.load_pem_private_key(
+        return serialization.load_pem_private_key(
             private_key_pem.encode('utf-8'),
             password=None
         )
@@ -28,22 +31,18 @@ def decrypt_file_content(encrypted_file_path):
         print(f"DEBUG: Key starts with: {private_key_pem[:30]}...") 
         raise ValueError(f"Invalid Private Key format: {e}")
 
-    try:
-        with open(encrypted_file_path, "rb") as f:
-            file_content = f.read()
-    except FileNotFoundError:
-        raise FileNotFoundError(f"File not found: {encrypted_file_path}")
 
-    rsa_segment_size = 256 
-    
-    if len(file_content) < rsa_segment_size:
+def split_encrypted(file_content):
+    """Split an encrypted submission into (RSA-wrapped session key, Fernet token)."""
+    if len(file_content) < RSA_SEGMENT_SIZE:
         raise ValueError("File is too short to contain a valid encrypted header.")
 
-    encrypted_session_key = file_content[:rsa_segment_size]
-    encrypted_data = file_content[rsa_segment_size:]
+    return file_content[:RSA_SEGMENT_SIZE], file_content[RSA_SEGMENT_SIZE:]
 
+
+def unwrap_session_key(private_key, encrypted_session_key):
     try:
-        session_key = private_key.decrypt(
+        return private_key.decrypt(
             encrypted_session_key,
             padding.OAEP(
                 mgf=padding.MGF1(algorithm=hashes.SHA256()),
@@ -54,13 +53,31 @@ def decrypt_file_content(encrypted_file_path):
     except Exception as e:
         raise ValueError(f"RSA Decryption failed. (Check if Public/Private keys match): {e}")
 
+
+def decrypt_data(session_key, encrypted_data):
     try:
         cipher_suite = Fernet(session_key)
-        decrypted_data = cipher_suite.decrypt(encrypted_data)
-        return decrypted_data
+        return cipher_suite.decrypt(encrypted_data)
     except Exception as e:
         raise ValueError(f"Data Decryption failed (Corrupted file?): {e}")
 
+
+def read_encrypted_file(encrypted_file_path):
+    try:
+        with open(encrypted_file_path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File not found: {encrypted_file_path}")
+
+
+def decrypt_file_content(encrypted_file_path):
+    private_key = load_private_key()
+    file_content = read_encrypted_file(encrypted_file_path)
+
+    encrypted_session_key, encrypted_data = split_encrypted(file_content)
+    session_key = unwrap_session_key(private_key, encrypted_session_key)
+    return decrypt_data(session_key, encrypted_data)
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python decrypt.py <filename>")
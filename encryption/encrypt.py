@@ -4,17 +4,16 @@ from cryptography.hazmat.primitives import serialization, hashes
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.fernet import Fernet
 
-def encrypt_file(input_file_path):
+def load_public_key():
     _dir = os.path.dirname(os.path.abspath(__file__))
     key_path = os.path.join(_dir, "public_key.pem")
     with open(key_path, "rb") as key_file:
-        public_key = serialization.load_pem_public_key(key_file.read())
+        return serialization.load_pem_public_key(key_file.read())
 
+def encrypt_bytes(file_data, public_key):
+    """Hybrid-encrypt raw bytes: RSA-wrapped Fernet key followed by the Fernet token."""
     session_key = Fernet.generate_key()
     cipher_suite = Fernet(session_key)
-
-    with open(input_file_path, "rb") as f:
-        file_data = f.read()
     encrypted_data = cipher_suite.encrypt(file_data)
 
     encrypted_session_key = public_key.encrypt(
@@ -25,11 +24,17 @@ def encrypt_file(input_file_path):
             label=None
         )
     )
+    return encrypted_session_key + encrypted_data
+
+def encrypt_file(input_file_path):
+    public_key = load_public_key()
+
+    with open(input_file_path, "rb") as f:
+        file_data = f.read()
 
     output_file = input_file_path + ".enc"
     with open(output_file, "wb") as f:
-        f.write(encrypted_session_key) 
-        f.write(encrypted_data)
+        f.write(encrypt_bytes(file_data, public_key))
     
     print(f"Success! Encrypted to '{output_file}' (Hybrid Mode).")
 
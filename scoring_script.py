@@ -6,6 +6,14 @@ import pandas as pd
 import json
 from sklearn.metrics import accuracy_score
 import argparse
+import sys
+
+# Stage instrumentation lives with the pipeline scripts
+scripts_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts")
+if scripts_dir not in sys.path:
+    sys.path.insert(0, scripts_dir)
+
+from instrumentation import stage
 
 
 # -----------------------------
@@ -18,18 +26,37 @@ def decode_tensor(secret_name, dtype):
     return torch.from_numpy(arr)
 
 
-def evaluate(submission_file):
+def load_secrets():
+    """Decode the private labels and test masks from the environment."""
+    return {
+        "y": decode_tensor("PRIVATE_Y", np.int64),
+        "test_mask_challenge": decode_tensor("PRIVATE_TEST_MASK_CHALLENGE", np.bool_),
+        "test_mask": decode_tensor("PRIVATE_TEST_MASK", np.bool_),
+    }
+
+
+def evaluate(submission_file, secrets=None):
+    """
+    Score a submission. `submission_file` is a path or a file-like object
+    (e.g. io.BytesIO of a decrypted submission); `secrets` may be passed in
+    to reuse the output of load_secrets() across several submissions.
+    """
     # -----------------------------
     # Load secrets
     # -----------------------------
-    y = decode_tensor("PRIVATE_Y", np.int64)
-    test_mask_challenge = decode_tensor("PRIVATE_TEST_MASK_CHALLENGE", np.bool_)
-    test_mask = decode_tensor("PRIVATE_TEST_MASK", np.bool_)
+    if secrets is None:
+        with stage("load_secrets"):
+            secrets = load_secrets()
+
+    y = secrets["y"]
+    test_mask_challenge = secrets["test_mask_challenge"]
+    test_mask = secrets["test_mask"]
 
     # -----------------------------
     # Load participant submission
     # -----------------------------
-    submission = pd.read_csv(submission_file)
+    with stage("parse_csv"):
+        submission = pd.read_csv(submission_file)
 
     if len(submission) != len(test_mask):
         raise ValueError(
@@ -50,9 +77,10 @@ def evaluate(submission_file):
     # -----------------------------
     # Metrics
     # -----------------------------
-    challenge_acc = accuracy_score(y_challenge, pred_challenge.numpy())
-    original_acc  = accuracy_score(y_original, pred_original.numpy())
-    gap = challenge_acc - original_acc
+    with stage("compute_metrics"):
+        challenge_acc = accuracy_score(y_challenge, pred_challenge.numpy())
+        original_acc  = accuracy_score(y_original, pred_original.numpy())
+        gap = challenge_acc - original_acc
 
     print(f"Challenge Accuracy: {challenge_acc:.4f}")
     print(f"Original Accuracy : {original_acc:.4f}")
@@ -0,0 +1,280 @@
+"""
+Pairwise agreement between all submissions on the challenge test nodes.
+
+Loads every submission once (decrypted CSVs, or .enc files decrypted in
+memory with a single private key), restricts the predictions to the
+PRIVATE_TEST_MASK_CHALLENGE nodes and bit-packs them one-hot: one bit per
+(node, class), plus an "other" class for invalid predictions, so each node
+has exactly one bit set. Two submissions then disagree on
+popcount(a XOR b) / 2 nodes, and the full submissions x submissions matrix
+is a blocked XOR + popcount over uint64 words (a few seconds for thousands
+of submissions).
+
+Reports near-duplicate pairs (agreement >= --threshold) and, when PRIVATE_Y
+is available, the best majority-vote ensembles among the most accurate
+submissions.
+
+Usage:
+    python scripts/agreement_matrix.py                          # submissions/*.csv
+    python scripts/agreement_matrix.py --encrypted --output results/agreement.json
+"""
+import argparse
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Get absolute project root (one level above /scripts)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+
+# Add project root to Python path if not already there
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scoring_script import decode_tensor
+
+SUBMISSION_DIR = Path(project_root) / "submissions"
+
+THRESHOLD = 0.99
+NUM_CLASSES = 6  # CiteSeer; used when PRIVATE_Y is not available
+ENSEMBLE_SIZE = 3
+ENSEMBLE_CANDIDATES = 20
+TILE_BYTES = 8 * 1024 * 1024      # XOR tile of the agreement matrix
+BLOCK_BYTES = 256 * 1024 * 1024   # vote tensor of ensemble scoring
+
+if hasattr(np, "bitwise_count"):
+    popcount = np.bitwise_count
+else:
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(words):
+        return _POPCOUNT_TABLE[words.view(np.uint8)].reshape(words.shape + (8,)).sum(-1)
+
+
+# -----------------------------
+# Loading
+# -----------------------------
+def load_submissions(submission_dir=SUBMISSION_DIR, encrypted=False):
+    """{team: CSV bytes} for every submission under `submission_dir`."""
+    submission_dir = Path(submission_dir)
+    contents = {}
+    if encrypted:
+        from encryption.decrypt import load_private_key
+        from process_submission import decrypt_submission_content
+
+        private_key = load_private_key()  # once, not per submission
+        for path in sorted(submission_dir.rglob("*.enc")):
+            content, team = decrypt_submission_content(str(path), private_key)
+            contents[team] = content
+    else:
+        for path in sorted(submission_dir.glob("*.csv")):
+            if "sample" not in path.name.lower():
+                contents[path.stem] = path.read_bytes()
+    return contents
+
+
+def prediction_matrix(contents, num_nodes):
+    """Stack predictions into a submissions x nodes int64 matrix (skipping bad files)."""
+    teams, rows = [], []
+    for team, content in contents.items():
+        try:
+            preds = pd.read_csv(io.BytesIO(content)).to_numpy().ravel()
+            if not np.issubdtype(preds.dtype, np.integer):
+                raise ValueError(f"non-integer predictions ({preds.dtype})")
+            preds = preds.astype(np.int64)
+        except (ValueError, TypeError, OverflowError, pd.errors.ParserError) as e:
+            print(f"✗ Skipping {team}: {e}")
+            continue
+        if len(preds) != num_nodes:
+            print(f"✗ Skipping {team}: {len(preds)} rows, expected {num_nodes}")
+            continue
+        teams.append(team)
+        rows.append(preds)
+    return teams, np.stack(rows) if rows else np.empty((0, num_nodes), dtype=np.int64)
+
+
+# -----------------------------
+# Bit-packed agreement
+# -----------------------------
+def pack_one_hot(preds, num_classes):
+    """
+    One-hot bit-pack submissions x nodes predictions into uint64 words
+    (num_classes + 1 bit planes). Predictions < 0 or >= num_classes all go
+    to the last, "other" plane, so `num_classes` must come from the labels,
+    never from the predictions.
+    """
+    classes = np.where((preds >= 0) & (preds < num_classes), preds, num_classes)
+    planes = [np.packbits(classes == c, axis=1) for c in range(num_classes + 1)]
+    packed = np.concatenate(planes, axis=1)
+    padding = -packed.shape[1] % 8
+    packed = np.pad(packed, ((0, 0), (0, padding)))
+    return np.ascontiguousarray(packed).view(np.uint64)
+
+
+def agreement_matrix(packed, num_nodes, tile_bytes=TILE_BYTES):
+    """
+    Fraction of nodes on which each pair of submissions agrees. Rows are
+    processed in blocks, accumulating XOR popcounts one word at a time so
+    the temporaries stay cache-sized.
+    """
+    count, words = packed.shape
+    columns = np.ascontiguousarray(packed.T)  # words x submissions
+    counter = np.uint16 if 2 * num_nodes <= np.iinfo(np.uint16).max else np.uint32
+    agreement = np.empty((count, count), dtype=np.float32)
+    block = max(1, tile_bytes // (count * 8))
+    for start in range(0, count, block):
+        stop = min(start + block, count)
+        differing = np.zeros((stop - start, count), dtype=counter)
+        for word in columns:
+            differing += popcount(word[start:stop, None] ^ word[None, :]).astype(counter, copy=False)
+        agreement[start:stop] = 1 - differing / (2 * num_nodes)
+    return agreement
+
+
+def near_duplicates(teams, agreement, threshold=THRESHOLD):
+    """Pairs agreeing on at least `threshold` of the nodes, most similar first."""
+    i, j = np.nonzero(np.triu(agreement >= threshold, k=1))
+    order = np.argsort(-agreement[i, j], kind="stable")
+    return [
+        {"teams": [teams[a], teams[b]], "agreement": float(agreement[a, b])}
+        for a, b in zip(i[order], j[order])
+    ]
+
+
+# -----------------------------
+# Majority-vote ensembles
+# -----------------------------
+def best_ensembles(teams, preds, y, agreement, num_classes, size=ENSEMBLE_SIZE,
+                   candidates=ENSEMBLE_CANDIDATES, top=10):
+    """
+    Score every `size`-subset of the `candidates` most accurate submissions
+    by majority vote (ties go to the most accurate member).
+    """
+    accuracy = (preds == y).mean(axis=1)
+    pool = np.argsort(-accuracy, kind="stable")[:candidates]
+    if len(pool) < size:
+        return []
+
+    combos = np.array(list(itertools.combinations(range(len(pool)), size)))
+    members = pool[combos]  # sorted by accuracy within each combo
+
+    one_hot = np.eye(num_classes + 1, dtype=np.int16)[
+        np.where((preds[pool] >= 0) & (preds[pool] < num_classes), preds[pool], num_classes)
+    ]
+    results = []
+    per_combo = size * one_hot[0].nbytes
+    chunks = -(-len(combos) * per_combo // BLOCK_BYTES)
+    for chunk in np.array_split(np.arange(len(combos)), max(1, chunks)):
+        votes = one_hot[combos[chunk]].sum(axis=1) * 2 + one_hot[combos[chunk, 0]]
+        vote = votes[..., :num_classes].argmax(-1)
+        results.append((vote == y).mean(axis=1))
+    ensemble_accuracy = np.concatenate(results)
+
+    best = []
+    for index in np.argsort(-ensemble_accuracy, kind="stable")[:top]:
+        group = members[index]
+        pairs = [agreement[a, b] for a, b in itertools.combinations(group, 2)]
+        best.append({
+            "teams": [teams[m] for m in group],
+            "challenge_accuracy": float(ensemble_accuracy[index]),
+            "best_member_accuracy": float(accuracy[group].max()),
+            "mean_pairwise_agreement": float(np.mean(pairs)),
+        })
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pairwise agreement between all submissions")
+    parser.add_argument("--submissions", default=str(SUBMISSION_DIR))
+    parser.add_argument("--encrypted", action="store_true",
+                        help="Read .enc files and decrypt them in memory (needs SUBMISSION_PRIVATE_KEY)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="Agreement at or above which a pair is a near-duplicate")
+    parser.add_argument("--ensemble-size", type=int, nargs="+", default=[ENSEMBLE_SIZE])
+    parser.add_argument("--ensemble-candidates", type=int, default=ENSEMBLE_CANDIDATES,
+                        help="Most accurate submissions considered for ensembles")
+    parser.add_argument("--classes", type=int,
+                        help=f"Number of classes (default: from PRIVATE_Y, else {NUM_CLASSES})")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", help="Write the report as JSON")
+    parser.add_argument("--matrix", help="Save the agreement matrix (.npy)")
+    args = parser.parse_args()
+
+    # -----------------------------
+    # Secrets: challenge test mask (and labels, for ensembles)
+    # -----------------------------
+    test_mask = decode_tensor("PRIVATE_TEST_MASK_CHALLENGE", np.bool_).numpy()
+    y = decode_tensor("PRIVATE_Y", np.int64).numpy() if "PRIVATE_Y" in os.environ else None
+
+    start = time.perf_counter()
+    teams, preds = prediction_matrix(
+        load_submissions(args.submissions, args.encrypted), len(test_mask)
+    )
+    load_seconds = time.perf_counter() - start
+    if len(teams) < 2:
+        print(f"Need at least two submissions, found {len(teams)}")
+        return 1
+
+    preds = preds[:, test_mask]
+    # From the labels only: an out-of-range prediction must not add bit planes
+    if args.classes:
+        num_classes = args.classes
+    elif y is not None:
+        num_classes = int(y.max()) + 1
+    else:
+        num_classes = NUM_CLASSES
+
+    start = time.perf_counter()
+    agreement = agreement_matrix(pack_one_hot(preds, num_classes), preds.shape[1])
+    matrix_seconds = time.perf_counter() - start
+
+    duplicates = near_duplicates(teams, agreement, args.threshold)
+    report = {
+        "submissions": len(teams),
+        "test_nodes": int(preds.shape[1]),
+        "load_seconds": load_seconds,
+        "matrix_seconds": matrix_seconds,
+        "threshold": args.threshold,
+        "near_duplicates": duplicates,
+        "ensembles": {},
+    }
+    print(f"Loaded {len(teams)} submissions in {load_seconds:.2f}s, "
+          f"agreement matrix in {matrix_seconds:.2f}s")
+
+    print(f"\n{len(duplicates)} near-duplicate pair(s) (agreement >= {args.threshold}):")
+    for pair in duplicates[:args.top]:
+        print(f"  {pair['agreement']:.4f}  {pair['teams'][0]} ~ {pair['teams'][1]}")
+
+    if y is None:
+        print("\nPRIVATE_Y not set, skipping ensembles")
+    else:
+        y = y[test_mask]
+        for size in args.ensemble_size:
+            ensembles = best_ensembles(teams, preds, y, agreement, num_classes, size,
+                                       args.ensemble_candidates, args.top)
+            report["ensembles"][str(size)] = ensembles
+            print(f"\nBest {size}-member majority votes:")
+            for e in ensembles:
+                print(f"  {e['challenge_accuracy']:.4f} (best member {e['best_member_accuracy']:.4f}, "
+                      f"agreement {e['mean_pairwise_agreement']:.3f})  {' + '.join(e['teams'])}")
+
+    if args.matrix:
+        np.save(args.matrix, agreement)
+        print(f"\nSaved agreement matrix to {args.matrix}")
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(dict(report, teams=teams), f, indent=2)
+        print(f"Saved report to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Synthetic-load benchmark for the submission pipeline.
+
+Generates a throwaway RSA key pair, synthetic labels/test masks (the same
+base64 secrets the workflow provides) and thousands of encrypted synthetic
+team submissions in a scratch directory, then runs every submission through
+run_pipeline end to end and reports per-stage throughput and latency
+percentiles. Nothing touches the real secrets, submissions or leaderboard.
+
+Usage:
+    python scripts/benchmark_pipeline.py --teams 2000 --output results/benchmark.json
+"""
+import argparse
+import base64
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+# Get absolute project root (one level above /scripts)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+
+# Add project root to Python path if not already there
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from encryption.encrypt import encrypt_bytes
+from instrumentation import StageRecorder, summarize
+
+SUBMISSION_TYPES = ["human", "llm", "human + llm"]
+
+
+def make_secrets(num_nodes, num_classes, test_size, rng):
+    """Synthetic labels and test masks, encoded like the GitHub secrets."""
+    y = rng.integers(0, num_classes, num_nodes).astype(np.int64)
+
+    order = rng.permutation(num_nodes)
+    test_mask_challenge = np.zeros(num_nodes, dtype=np.bool_)
+    test_mask_challenge[order[:test_size]] = True
+    test_mask = np.zeros(num_nodes, dtype=np.bool_)
+    test_mask[order[test_size:2 * test_size]] = True
+
+    env = {
+        "PRIVATE_Y": base64.b64encode(y.tobytes()).decode(),
+        "PRIVATE_TEST_MASK_CHALLENGE": base64.b64encode(test_mask_challenge.tobytes()).decode(),
+        "PRIVATE_TEST_MASK": base64.b64encode(test_mask.tobytes()).decode(),
+    }
+    return y, env
+
+
+def make_key_pair():
+    """Throwaway 2048-bit key pair, same parameters as generate_keys.py."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem_private = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption()
+    )
+    return private_key.public_key(), pem_private.decode()
+
+
+def make_submissions(workdir, teams, y, num_classes, public_key, rng):
+    """
+    Write one directory per team containing <team>.enc and metadata.json,
+    as the workflow would see them. Returns [(team, directory)].
+    """
+    submissions = []
+    for i in range(teams):
+        team = f"team{i:05d}"
+
+        # Each team is correct on a random fraction of nodes
+        accuracy = rng.uniform(0.3, 0.9)
+        preds = np.where(
+            rng.random(len(y)) < accuracy, y, rng.integers(0, num_classes, len(y))
+        )
+        csv = ("preds\n" + "\n".join(map(str, preds)) + "\n").encode()
+
+        team_dir = workdir / "submissions" / team
+        team_dir.mkdir(parents=True, exist_ok=True)
+        with open(team_dir / f"{team}.enc", "wb") as f:
+            f.write(encrypt_bytes(csv, public_key))
+        with open(team_dir / "metadata.json", "w") as f:
+            json.dump({"team": team, "submission_type": rng.choice(SUBMISSION_TYPES)}, f)
+
+        submissions.append((team, team_dir))
+    return submissions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the submission pipeline on synthetic load")
+    parser.add_argument("--teams", type=int, default=1000, help="Number of synthetic submissions")
+    parser.add_argument("--nodes", type=int, default=3327, help="Nodes per submission")
+    parser.add_argument("--classes", type=int, default=6, help="Number of classes")
+    parser.add_argument("--test-size", type=int, default=1000, help="Nodes in each test mask")
+    parser.add_argument("--skip-leaderboard", action="store_true",
+                        help="Do not record results or regenerate the leaderboard")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record peak Python heap growth per stage (slower)")
+    parser.add_argument("--workdir", help="Scratch directory (default: a new temp dir)")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="Show pipeline output")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="pipeline-benchmark-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    # -----------------------------
+    # Synthetic secrets, keys and submissions
+    # -----------------------------
+    setup_start = time.perf_counter()
+    y, secret_env = make_secrets(args.nodes, args.classes, args.test_size, rng)
+    public_key, pem_private = make_key_pair()
+    submissions = make_submissions(workdir, args.teams, y, args.classes, public_key, rng)
+    setup_seconds = time.perf_counter() - setup_start
+    print(f"Generated {len(submissions)} encrypted submissions in {setup_seconds:.2f}s ({workdir})")
+
+    # Only this process sees the synthetic secrets; the leaderboard is
+    # written to the scratch directory.
+    os.environ.update(secret_env)
+    os.environ["SUBMISSION_PRIVATE_KEY"] = pem_private
+    os.environ["LEADERBOARD_DIR"] = str(workdir / "site")
+    (workdir / "site").mkdir(exist_ok=True)
+
+    # Import after LEADERBOARD_DIR is set
+    from run_pipeline import run_pipeline
+
+    # -----------------------------
+    # Drive the pipeline
+    # -----------------------------
+    failures = 0
+    output = None if args.verbose else io.StringIO()
+    with StageRecorder(trace_memory=args.trace_memory) as recorder:
+        run_start = time.perf_counter()
+        for team, team_dir in submissions:
+            with contextlib.redirect_stdout(output) if output else contextlib.nullcontext():
+                result = run_pipeline(
+                    team_dir,
+                    github_actor=team,
+                    update_leaderboard=not args.skip_leaderboard
+                )
+            if output:
+                output.seek(0)
+                output.truncate()
+            if not result.ok:
+                failures += 1
+                print(f"✗ {team}: {result.failed_stage}: {result.error}")
+        run_seconds = time.perf_counter() - run_start
+
+    report = {
+        "config": {
+            "teams": args.teams,
+            "nodes": args.nodes,
+            "classes": args.classes,
+            "test_size": args.test_size,
+            "update_leaderboard": not args.skip_leaderboard,
+            "trace_memory": args.trace_memory,
+            "seed": args.seed,
+        },
+        "setup_seconds": setup_seconds,
+        "run_seconds": run_seconds,
+        "submissions_per_second": len(submissions) / run_seconds if run_seconds > 0 else None,
+        "failures": failures,
+        "stages": summarize(recorder.records),
+    }
+
+    # -----------------------------
+    # Report
+    # -----------------------------
+    print(f"\n{len(submissions)} submissions in {run_seconds:.2f}s "
+          f"({report['submissions_per_second']:.1f}/s), {failures} failure(s)\n")
+    print(f"{'stage':<20}{'count':>8}{'total s':>10}{'ops/s':>10}"
+          f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    for name, stats in report["stages"].items():
+        throughput = stats["throughput_per_second"] or float("inf")
+        print(f"{name:<20}{stats['count']:>8}{stats['total_seconds']:>10.2f}{throughput:>10.1f}"
+              f"{stats['p50_seconds'] * 1000:>10.2f}{stats['p90_seconds'] * 1000:>10.2f}"
+              f"{stats['p99_seconds'] * 1000:>10.2f}")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved benchmark report to {args.output}")
+
+    return 0 if failures == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,22 @@
 """
 Extract scores from evaluation output and format them for leaderboard.
+
+If the submission CSV is given, the SHA-256 of its content is appended as a
+fifth field so the submission history can identify identical predictions.
 """
 import json
 import sys
 import re
 from pathlib import Path
 
+from submission_history import content_hash
+
 if len(sys.argv) < 2:
-    print("Usage: python extract_scores.py <team_name>", file=sys.stderr)
+    print("Usage: python extract_scores.py <team_name> [submission_csv]", file=sys.stderr)
     sys.exit(1)
 
 team_name = sys.argv[1]
+submission_file = Path(sys.argv[2]) if len(sys.argv) > 2 else None
 output_file = Path(f"results/{team_name}_output.txt")
 
 if not output_file.exists():
@@ -25,7 +31,10 @@ try:
     json_match = re.search(r'\{.*\}', content, re.DOTALL)
     if json_match:
         scores = json.loads(json_match.group())
-        print(f"{team_name}:{scores.get('challenge_accuracy', 0.0):.6f}:{scores.get('original_accuracy', 0.0):.6f}:{scores.get('accuracy_gap', 0.0):.6f}")
+        line = f"{team_name}:{scores.get('challenge_accuracy', 0.0):.6f}:{scores.get('original_accuracy', 0.0):.6f}:{scores.get('accuracy_gap', 0.0):.6f}"
+        if submission_file is not None and submission_file.exists():
+            line += f":{content_hash(submission_file)}"
+        print(line)
     else:
         print(f"{team_name}:0.0:0.0:0.0", file=sys.stderr)
 except Exception as e:
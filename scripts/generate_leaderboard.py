@@ -1,15 +1,44 @@
 """
 Generate leaderboard from evaluation results.
+
+The static output is split into fixed-size pages so that page weight and
+regeneration cost stay constant as the number of teams grows:
+
+    leaderboard.html                  first page (GitHub Pages entry point)
+    leaderboard/index.json            small index describing the shards
+    leaderboard/shards/page-NNNN.json JSON shard with PAGE_SIZE ranked teams
+    leaderboard/page-NNNN.html        HTML page rendered from the same shard
+    leaderboard/teams/<team>.json     per-team submission history
+    leaderboard/teams/<team>.html     per-team history page
+
+Team histories come from the submission history store
+(see submission_history.py); leaderboard.json is its best-per-team view.
+
+Every generated file is keyed by a hash of the data it was rendered from
+(stored in leaderboard/manifest.json); files whose inputs did not change are
+neither re-rendered nor rewritten.
 """
+import hashlib
+import html as html_lib
 import json
+import os
 from datetime import datetime
 from pathlib import Path
 
+from submission_history import SubmissionHistory, content_hash
+
+# Where leaderboard.json, leaderboard.html, leaderboard/ and the submission
+# history live. LEADERBOARD_DIR lets benchmarks run against a scratch directory.
+REPO_ROOT = Path(os.environ.get('LEADERBOARD_DIR', Path(__file__).parent.parent))
+HISTORY_DB = REPO_ROOT / 'submission_history.db'
+SITE_DIR = REPO_ROOT / 'leaderboard'
+PAGE_SIZE = 50
+
 def format_datetime(iso_string):
     """Format ISO datetime string to human-readable format."""
     if not iso_string:
         return "Never"
-    
+
     try:
         # Parse ISO format (handle both with and without timezone)
         dt = datetime.fromisoformat(iso_string.replace('Z', '+00:00'))
@@ -25,7 +54,7 @@ def format_datetime(iso_string):
 
 def load_evaluation_results():
     """Load evaluation results."""
-    results_file = Path(__file__).parent.parent / 'evaluation_results.json'
+    results_file = REPO_ROOT / 'evaluation_results.json'
     if results_file.exists():
         with open(results_file, 'r') as f:
             return json.load(f)
@@ -33,117 +62,191 @@ def load_evaluation_results():
 
 def load_existing_leaderboard():
     """Load existing leaderboard."""
-    leaderboard_file = Path(__file__).parent.parent / 'leaderboard.json'
+    leaderboard_file = REPO_ROOT / 'leaderboard.json'
     if leaderboard_file.exists():
         with open(leaderboard_file, 'r') as f:
             return json.load(f)
     return {"last_updated": None, "submissions": []}
 
-def generate_leaderboard():
-    """Generate leaderboard from all results."""
-    results = load_evaluation_results()
-    existing = load_existing_leaderboard()
-    
-    # Create a map of existing submissions
-    existing_map = {sub['team']: sub for sub in existing.get('submissions', [])}
-    
-    # Process new results
-    for result in results:
-        team = result['team']
-        scores = result['scores']
-        
-        entry = {
-            'team': team,
-            'submission_file': result['file'],
-            'challenge_accuracy': scores.get('challenge_accuracy', 0.0),
-            'original_accuracy': scores.get('original_accuracy', 0.0),
-            'gap': scores.get('accuracy_gap', 0.0),
-            'timestamp': datetime.now().isoformat()
-        }
-        
-        # Update if better score or new team
-        if team not in existing_map or entry['challenge_accuracy'] > existing_map[team]['challenge_accuracy']:
-            existing_map[team] = entry
-    
-    # Convert to list and sort
-    submissions = list(existing_map.values())
-    submissions.sort(key=lambda x: x['challenge_accuracy'], reverse=True)
-    
+def open_history():
+    """
+    Open the submission history store, seeding it from the legacy
+    leaderboard.json the first time it is created.
+    """
+    history = SubmissionHistory(HISTORY_DB)
+    if not len(history):
+        history.import_leaderboard(load_existing_leaderboard())
+    return history
+
+def save_leaderboard(history):
+    """Write leaderboard.json as the best-per-team view of the history."""
     leaderboard = {
         'last_updated': datetime.now().isoformat(),
-        'submissions': submissions
+        'submissions': history.leaderboard()
     }
-    
-    # Save JSON
-    leaderboard_file = Path(__file__).parent.parent / 'leaderboard.json'
+
+    leaderboard_file = REPO_ROOT / 'leaderboard.json'
     with open(leaderboard_file, 'w') as f:
         json.dump(leaderboard, f, indent=2)
-    
-    # Generate HTML
-    generate_html(leaderboard)
-    
-    print(f"Generated leaderboard with {len(submissions)} teams")
+
+    return leaderboard
+
+def is_recorded(history, result, digest):
+    """
+    Whether `result` is already in the history: same team and content hash,
+    or (submission file gone) same team and scores without a hash.
+    """
+    if digest:
+        return history.has_submission(result['team'], digest)
+    return history.has_submission(result['team'], '', result['scores'])
+
+def generate_leaderboard():
+    """Generate leaderboard from all results."""
+    results = load_evaluation_results()
+
+    with open_history() as history:
+        # Record new results. evaluation_results.json is not consumed, so skip
+        # results already in the history or every run would add them again
+        for result in results:
+            submission_file = Path(result['file'])
+            digest = content_hash(submission_file) if submission_file.exists() else ''
+            if is_recorded(history, result, digest):
+                continue
+            history.record(
+                result['team'],
+                result['scores'],
+                digest,
+                result.get('submission_type')
+            )
+
+        leaderboard = save_leaderboard(history)
+
+        # Generate HTML
+        generate_html(leaderboard, history)
+
+    print(f"Generated leaderboard with {len(leaderboard['submissions'])} teams")
     return leaderboard
 
-def generate_html(leaderboard):
-    """Generate simple HTML leaderboard (no animations, no canvas)."""
+# ----------------------------
+# Incremental file output
+# ----------------------------
+def load_site_manifest():
+    """Load the map of generated file -> hash of the data it was rendered from."""
+    manifest_file = SITE_DIR / 'manifest.json'
+    if manifest_file.exists():
+        with open(manifest_file, 'r') as f:
+            return json.load(f)
+    return {}
+
+def save_site_manifest(manifest):
+    """Save the generated-file manifest."""
+    SITE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(SITE_DIR / 'manifest.json', 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+def content_key(payload):
+    """Stable hash of the data a file is rendered from."""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def write_if_changed(path, payload, render, manifest):
+    """
+    Render and write `path` only if `payload` differs from the one it was
+    last rendered from (or the file is missing). Returns True if written.
+    """
+    rel = path.relative_to(REPO_ROOT).as_posix()
+    key = content_key(payload)
+    if manifest.get(rel) == key and path.exists():
+        return False
 
-    html = """<!DOCTYPE html>
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(render(payload))
+    manifest[rel] = key
+    return True
+
+def remove_stale(path, manifest):
+    """Remove a generated file that is no longer part of the site."""
+    rel = path.relative_to(REPO_ROOT).as_posix()
+    manifest.pop(rel, None)
+    if path.exists():
+        path.unlink()
+
+# ----------------------------
+# HTML rendering
+# ----------------------------
+HTML_HEAD = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
-    <title>GNN Mini Challenge – Leaderboard</title>
+    <title>{title}</title>
     <style>
-        body {
+        body {{
             font-family: Arial, Helvetica, sans-serif;
             background-color: #f4f6f8;
             padding: 40px;
-        }
+        }}
 
-        h1 {
+        h1 {{
             text-align: center;
             margin-bottom: 30px;
-        }
+        }}
 
-        table {
+        table {{
             width: 100%;
             max-width: 900px;
             margin: 0 auto;
             border-collapse: collapse;
             background: white;
             box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        }
+        }}
 
-        thead {
+        thead {{
             background-color: #2c3e50;
             color: white;
-        }
+        }}
 
-        th, td {
+        th, td {{
             padding: 14px 16px;
             text-align: left;
-        }
+        }}
 
-        th {
+        th {{
             text-transform: uppercase;
             font-size: 0.85em;
             letter-spacing: 0.05em;
-        }
+        }}
 
-        tbody tr:nth-child(even) {
+        tbody tr:nth-child(even) {{
             background-color: #f9f9f9;
-        }
+        }}
+
+        td a {{
+            color: inherit;
+        }}
 
-        .num {
+        .num {{
             font-family: "Courier New", monospace;
             font-weight: bold;
-        }
+        }}
 
-        .gap {
+        .gap {{
             color: #c0392b;
-        }
+        }}
 
-        .footer {
+        .pager {{
+            max-width: 900px;
+            margin: 20px auto 0;
+            display: flex;
+            justify-content: space-between;
+        }}
+
+        .pager a {{
+            color: #2c3e50;
+            font-weight: bold;
+        }}
+
+        .footer {{
             max-width: 900px;
             margin: 30px auto 0;
             text-align: center;
@@ -152,23 +255,55 @@ def generate_html(leaderboard):
             box-shadow: 0 4px 12px rgba(0,0,0,0.1);
             border-radius: 4px;
             font-size: 1em;
-        }
+        }}
 
-        .footer a {
+        .footer a {{
             color: #2c3e50;
             text-decoration: none;
             font-weight: bold;
-        }
+        }}
 
-        .footer a:hover {
+        .footer a:hover {{
             text-decoration: underline;
-        }
+        }}
     </style>
 </head>
 <body>
 
-<h1>🏆 GNN Mini Challenge Leaderboard</h1>
+<h1>{heading}</h1>
+"""
+
+HTML_FOOTER = """
+<div class="footer">
+    <p>Submit your solution via Pull Request to appear on the leaderboard!</p>
+    <p style="margin-top: 10px; font-size: 0.95em;">
+        <a href="https://github.com/gururgg/GNN-Mini-Challange"
+           target="_blank"
+           rel="noopener noreferrer">
+            🔗 View Repository on GitHub
+        </a>
+    </p>
+</div>
+
+</body>
+</html>
+"""
+
+def page_name(page):
+    """File name (without extension) of a leaderboard page, 1-based."""
+    return f"page-{page:04d}"
 
+def render_page(payload, prefix=""):
+    """
+    Render one leaderboard page. `prefix` is the path from the output file to
+    the leaderboard/ directory ("" for pages inside it, "leaderboard/" for the
+    root leaderboard.html).
+    """
+    html = HTML_HEAD.format(
+        title="GNN Mini Challenge – Leaderboard",
+        heading="🏆 GNN Mini Challenge Leaderboard"
+    )
+    html += """
 <table>
     <thead>
         <tr>
@@ -183,7 +318,7 @@ def generate_html(leaderboard):
     <tbody>
 """
 
-    submissions = leaderboard.get("submissions", [])
+    submissions = payload["entries"]
 
     if not submissions:
         html += """
@@ -194,15 +329,16 @@ def generate_html(leaderboard):
         </tr>
 """
     else:
-        for idx, entry in enumerate(submissions, start=1):
+        for entry in submissions:
             timestamp = entry.get("timestamp", "")
             if timestamp:
                 timestamp = format_datetime(timestamp)
 
+            team = html_lib.escape(entry['team'])
             html += f"""
         <tr>
-            <td>{idx}</td>
-            <td><strong>{entry['team']}</strong></td>
+            <td>{entry['rank']}</td>
+            <td><strong><a href="{prefix}teams/{team}.html">{team}</a></strong></td>
             <td class="num">{entry['challenge_accuracy']:.4f}</td>
             <td class="num">{entry['original_accuracy']:.4f}</td>
             <td class="num gap">{entry['gap']:.4f}</td>
@@ -213,28 +349,199 @@ def generate_html(leaderboard):
     html += """
     </tbody>
 </table>
+"""
 
-<div class="footer">
-    <p>Submit your solution via Pull Request to appear on the leaderboard!</p>
-    <p style="margin-top: 10px; font-size: 0.95em;">
-        <a href="https://github.com/gururgg/GNN-Mini-Challange"
-           target="_blank"
-           rel="noopener noreferrer">
-            🔗 View Repository on GitHub
-        </a>
-    </p>
+    page = payload["page"]
+    if page > 1 or payload["has_next"]:
+        previous_link = next_link = "<span></span>"
+        if page > 1:
+            previous_link = f'<a href="{prefix}{page_name(page - 1)}.html">← Previous</a>'
+        if payload["has_next"]:
+            next_link = f'<a href="{prefix}{page_name(page + 1)}.html">Next →</a>'
+        html += f"""
+<div class="pager">
+    {previous_link}
+    <span>Page {page}</span>
+    {next_link}
 </div>
+"""
 
-</body>
-</html>
+    return html + HTML_FOOTER
+
+def render_team_page(payload):
+    """Render the submission history page of a single team."""
+    team = html_lib.escape(payload["team"])
+    html = HTML_HEAD.format(
+        title=f"GNN Mini Challenge – {team}",
+        heading=f"📈 {team}"
+    )
+    html += """
+<table>
+    <thead>
+        <tr>
+            <th>#</th>
+            <th>Challenge Accuracy</th>
+            <th>Original Accuracy</th>
+            <th>Gap</th>
+            <th>Type</th>
+            <th>Submission Time</th>
+        </tr>
+    </thead>
+    <tbody>
 """
-    
-    html_file = Path(__file__).parent.parent / 'leaderboard.html'
-    with open(html_file, 'w') as f:
-        f.write(html)
-    
-    print(f"Generated {html_file}")
+
+    # Most recent submission first
+    history = payload["history"]
+    for idx, entry in reversed(list(enumerate(history, start=1))):
+        html += f"""
+        <tr>
+            <td>{idx}</td>
+            <td class="num">{entry['challenge_accuracy']:.4f}</td>
+            <td class="num">{entry['original_accuracy']:.4f}</td>
+            <td class="num gap">{entry['gap']:.4f}</td>
+            <td>{html_lib.escape(entry.get('submission_type') or '–')}</td>
+            <td>{format_datetime(entry.get('timestamp', ''))}</td>
+        </tr>
+"""
+
+    if not history:
+        html += """
+        <tr>
+            <td colspan="6" style="text-align:center; padding: 40px;">
+                No submission history recorded.
+            </td>
+        </tr>
+"""
+
+    html += """
+    </tbody>
+</table>
+
+<div class="pager">
+    <a href="../../leaderboard.html">← Back to leaderboard</a>
+</div>
+"""
+
+    return html + HTML_FOOTER
+
+def render_json(payload):
+    """Render a JSON shard."""
+    return json.dumps(payload, indent=2)
+
+# ----------------------------
+# Static site
+# ----------------------------
+def paginate(submissions, page_size=PAGE_SIZE):
+    """Split ranked submissions into page payloads (at least one page)."""
+    pages = []
+    for start in range(0, max(len(submissions), 1), page_size):
+        pages.append({
+            "page": len(pages) + 1,
+            "has_next": start + page_size < len(submissions),
+            "entries": submissions[start:start + page_size]
+        })
+    return pages
+
+def generate_html(leaderboard, history=None, page_size=PAGE_SIZE):
+    """
+    Generate the paginated static leaderboard, rewriting only changed files.
+    `history` (a SubmissionHistory) provides the per-team history pages.
+    """
+    manifest = load_site_manifest()
+    written = []
+
+    submissions = [
+        dict(entry, rank=entry.get("rank", idx))
+        for idx, entry in enumerate(leaderboard.get("submissions", []), start=1)
+    ]
+    pages = paginate(submissions, page_size)
+
+    # Leaderboard pages and their JSON shards
+    shards = []
+    for payload in pages:
+        name = page_name(payload["page"])
+        shard_file = SITE_DIR / 'shards' / f'{name}.json'
+        page_file = SITE_DIR / f'{name}.html'
+
+        if write_if_changed(shard_file, payload, render_json, manifest):
+            written.append(shard_file)
+        if write_if_changed(page_file, payload, render_page, manifest):
+            written.append(page_file)
+
+        entries = payload["entries"]
+        shards.append({
+            "page": payload["page"],
+            "json": shard_file.relative_to(SITE_DIR).as_posix(),
+            "html": page_file.relative_to(SITE_DIR).as_posix(),
+            "first_rank": entries[0]["rank"] if entries else None,
+            "last_rank": entries[-1]["rank"] if entries else None
+        })
+
+    # The root leaderboard.html is the first page, linking into leaderboard/
+    root_page = REPO_ROOT / 'leaderboard.html'
+    if write_if_changed(root_page, pages[0],
+                        lambda payload: render_page(payload, prefix="leaderboard/"),
+                        manifest):
+        written.append(root_page)
+
+    # Drop pages left over from a longer leaderboard
+    page = len(pages) + 1
+    while (SITE_DIR / 'shards' / f'{page_name(page)}.json').exists():
+        remove_stale(SITE_DIR / 'shards' / f'{page_name(page)}.json', manifest)
+        remove_stale(SITE_DIR / f'{page_name(page)}.html', manifest)
+        page += 1
+
+    # Per-team history pages. The history is append-only, so the number of
+    # submissions identifies its content without querying it.
+    for entry in submissions:
+        team = entry["team"]
+        key = {"team": team, "submission_count": entry.get("submission_count", 0)}
+
+        def team_payload(_, team=team):
+            trend = history.team_trend(team) if history is not None else []
+            return {
+                "team": team,
+                "history": [
+                    {
+                        "challenge_accuracy": sub["challenge_accuracy"],
+                        "original_accuracy": sub["original_accuracy"],
+                        "gap": sub["accuracy_gap"],
+                        "submission_type": sub["submission_type"],
+                        "timestamp": sub["timestamp"]
+                    }
+                    for sub in trend
+                ]
+            }
+
+        team_json = SITE_DIR / 'teams' / f'{team}.json'
+        team_page = SITE_DIR / 'teams' / f'{team}.html'
+        if write_if_changed(team_json, key,
+                            lambda payload: render_json(team_payload(payload)),
+                            manifest):
+            written.append(team_json)
+        if write_if_changed(team_page, key,
+                            lambda payload: render_team_page(team_payload(payload)),
+                            manifest):
+            written.append(team_page)
+
+    # Small index so clients only fetch the shards they display
+    index = {
+        "last_updated": leaderboard.get("last_updated"),
+        "page_size": page_size,
+        "total_teams": len(submissions),
+        "page_count": len(pages),
+        "shards": shards
+    }
+    SITE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(SITE_DIR / 'index.json', 'w') as f:
+        json.dump(index, f, indent=2)
+
+    save_site_manifest(manifest)
+
+    for path in written:
+        print(f"Generated {path.relative_to(REPO_ROOT).as_posix()}")
+    print(f"Leaderboard site: {len(pages)} page(s), {len(written)} file(s) rewritten")
+    return written
 
 if __name__ == '__main__':
     generate_leaderboard()
-
@@ -0,0 +1,146 @@
+"""
+Stage-level timing and memory instrumentation for the submission pipeline.
+
+Code marks its stages with
+
+    with stage("rsa_unwrap"):
+        ...
+
+which is a no-op unless a StageRecorder is active:
+
+    with StageRecorder(trace_memory=True) as recorder:
+        run_pipeline(...)
+    print(recorder.to_json())
+
+Each record holds the stage name, wall-clock seconds, the peak Python heap
+growth during the stage (tracemalloc, only with trace_memory=True) and the
+process' max RSS after the stage (None on Windows, which has no `resource`
+module). Stages may nest; records keep their parent.
+"""
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows; the scorer imports this module there too
+    resource = None
+
+_active = None
+
+
+def max_rss_bytes():
+    """Peak resident set size of this process so far (None without `resource`)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class StageRecorder:
+    """Collects stage records while active (see module docstring)."""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.records = []
+        self._stack = []
+        self._previous = None
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        global _active
+        self._previous, _active = _active, self
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        _active = self._previous
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def stage(self, name, **info):
+        frame = {"name": name, "peak": 0, "baseline": 0}
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            # Fold the enclosing stage's peak so far into it before resetting
+            if self._stack:
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+            frame["baseline"] = frame["peak"] = current
+
+        parent = self._stack[-1]["name"] if self._stack else None
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+
+            record = {"stage": name, "parent": parent, "seconds": seconds}
+            if self.trace_memory:
+                peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                if self._stack:
+                    self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+                record["peak_traced_bytes"] = peak - frame["baseline"]
+            record["max_rss_bytes"] = max_rss_bytes()
+            record.update(info)
+            self.records.append(record)
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.records, **kwargs)
+
+
+@contextmanager
+def stage(name, **info):
+    """Record `name` on the active StageRecorder, if any."""
+    if _active is None:
+        yield
+        return
+    with _active.stage(name, **info):
+        yield
+
+
+def percentile(sorted_values, q):
+    """Linear-interpolated percentile (0-100) of an already sorted list."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+def summarize(records):
+    """Per-stage count, total time, throughput and latency percentiles."""
+    by_stage = {}
+    for record in records:
+        by_stage.setdefault(record["stage"], []).append(record)
+
+    summary = {}
+    for name, stage_records in by_stage.items():
+        seconds = sorted(r["seconds"] for r in stage_records)
+        total = sum(seconds)
+        summary[name] = {
+            "count": len(seconds),
+            "total_seconds": total,
+            "throughput_per_second": len(seconds) / total if total > 0 else None,
+            "mean_seconds": total / len(seconds),
+            "p50_seconds": percentile(seconds, 50),
+            "p90_seconds": percentile(seconds, 90),
+            "p99_seconds": percentile(seconds, 99),
+            "max_seconds": seconds[-1],
+        }
+        peaks = [r["peak_traced_bytes"] for r in stage_records if "peak_traced_bytes" in r]
+        if peaks:
+            summary[name]["max_peak_traced_bytes"] = max(peaks)
+    return summary
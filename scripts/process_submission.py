@@ -9,7 +9,14 @@ project_root = os.path.abspath(os.path.join(current_dir, ".."))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from encryption.decrypt import decrypt_file_content
+from encryption.decrypt import (
+    decrypt_data,
+    load_private_key,
+    read_encrypted_file,
+    split_encrypted,
+    unwrap_session_key,
+)
+from instrumentation import stage
 
 SUBMISSION_DIR = os.path.join(project_root, "submissions")
 
@@ -18,8 +25,8 @@ class SubmissionError(Exception):
     pass
 
 
-def get_single_encrypted_submission():
-    files = [f for f in os.listdir(SUBMISSION_DIR) if f.endswith(".enc")]
+def get_single_encrypted_submission(submission_dir=SUBMISSION_DIR):
+    files = [f for f in os.listdir(submission_dir) if f.endswith(".enc")]
 
     if len(files) == 0:
         raise SubmissionError("No encrypted (.enc) submission found.")
@@ -29,7 +36,7 @@ def get_single_encrypted_submission():
             "Multiple encrypted submissions detected. Only ONE .enc file is allowed per PR."
         )
 
-    return os.path.join(SUBMISSION_DIR, files[0])
+    return os.path.join(submission_dir, files[0])
 
 
 def extract_team_name(filename):
@@ -48,11 +55,32 @@ def extract_team_name(filename):
     return name
 
 
+def decrypt_submission_content(encrypted_path, private_key=None):
+    """
+    Decrypt a submission in memory, without writing the plaintext to disk.
+    Returns (decrypted_bytes, team_name).
+    """
+    if private_key is None:
+        with stage("load_private_key"):
+            private_key = load_private_key()
+
+    with stage("read_encrypted"):
+        encrypted_session_key, encrypted_data = split_encrypted(
+            read_encrypted_file(encrypted_path)
+        )
+    with stage("rsa_unwrap"):
+        session_key = unwrap_session_key(private_key, encrypted_session_key)
+    with stage("fernet_decrypt"):
+        decrypted_content = decrypt_data(session_key, encrypted_data)
+
+    team_name = extract_team_name(os.path.basename(encrypted_path))
+    return decrypted_content, team_name
+
+
 def decrypt_submission(encrypted_path):
-    decrypted_content = decrypt_file_content(encrypted_path)
+    decrypted_content, team_name = decrypt_submission_content(encrypted_path)
 
     # Always produce teamname.csv
-    team_name = extract_team_name(os.path.basename(encrypted_path))
     decrypted_path = os.path.join(SUBMISSION_DIR, f"{team_name}.csv")
 
     with open(decrypted_path, "wb") as f:
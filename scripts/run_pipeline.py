@@ -0,0 +1,229 @@
+"""
+Run the whole submission pipeline in a single process:
+
+    validate -> decrypt (in memory) -> score -> [history + leaderboard update]
+
+This replaces the chain validate_submission.py -> process_submission.py ->
+scoring_script.py --json -> extract_scores.py -> update_leaderboard_from_scores.py
+-> generate_leaderboard.py. Stages hand typed results to each other instead of
+printing and re-parsing text, and the decrypted CSV never touches the disk.
+
+Outputs (in --results-dir, default results/):
+    <team>.json   machine-readable result of the run, including per-stage
+                  timings (and memory with --trace-memory)
+    comment.md    body of the PR comment
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import traceback
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+# Get absolute project root (one level above /scripts)
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, ".."))
+
+# Add project root to Python path if not already there
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from validate_submission import SubmissionError as ValidationError, validate
+from process_submission import SubmissionError, decrypt_submission_content
+from scoring_script import evaluate
+from submission_history import content_hash
+from update_leaderboard_from_scores import record_scores
+from generate_leaderboard import generate_html, open_history, save_leaderboard
+from instrumentation import StageRecorder, stage
+
+SUBMISSION_DIR = Path(project_root) / "submissions"
+RESULTS_DIR = Path(project_root) / "results"
+
+
+@dataclass
+class ValidatedSubmission:
+    encrypted_path: Path
+    submission_type: str
+
+
+@dataclass
+class DecryptedSubmission:
+    team: str
+    content: bytes
+    content_hash: str
+
+
+@dataclass
+class Scores:
+    challenge_accuracy: float
+    original_accuracy: float
+    accuracy_gap: float
+
+
+@dataclass
+class PipelineResult:
+    team: Optional[str] = None
+    submission_type: Optional[str] = None
+    content_hash: Optional[str] = None
+    scores: Optional[Scores] = None
+    failed_stage: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+# -----------------------------
+# Stages
+# -----------------------------
+def validate_stage(submissions_dir=SUBMISSION_DIR, github_actor=None):
+    enc_file, metadata = validate(submissions_dir, github_actor)
+    return ValidatedSubmission(
+        encrypted_path=Path(enc_file),
+        submission_type=metadata["submission_type"]
+    )
+
+
+def decrypt_stage(validated, private_key=None):
+    content, team = decrypt_submission_content(str(validated.encrypted_path), private_key)
+    return DecryptedSubmission(team=team, content=content, content_hash=content_hash(content))
+
+
+def score_stage(decrypted, secrets=None):
+    scores = evaluate(io.BytesIO(decrypted.content), secrets)
+    return Scores(
+        challenge_accuracy=float(scores["challenge_accuracy"]),
+        original_accuracy=float(scores["original_accuracy"]),
+        accuracy_gap=float(scores["accuracy_gap"])
+    )
+
+
+def update_leaderboard_stage(result):
+    """Record a scored submission and regenerate the leaderboard."""
+    with open_history() as history:
+        with stage("record_history"):
+            record_scores(
+                history, result.team, asdict(result.scores),
+                result.content_hash, result.submission_type
+            )
+        with stage("save_leaderboard"):
+            leaderboard = save_leaderboard(history)
+        with stage("generate_html"):
+            generate_html(leaderboard, history)
+    return leaderboard
+
+
+def run_pipeline(submissions_dir=SUBMISSION_DIR, github_actor=None, secrets=None,
+                 update_leaderboard=False, private_key=None):
+    """
+    Run every stage in-process. Errors are captured in the returned
+    PipelineResult (failed_stage/error) rather than raised. `secrets` and
+    `private_key` may be passed in to reuse them across many submissions.
+    """
+    result = PipelineResult()
+    current = "validate"
+    try:
+        with stage("pipeline"):
+            with stage("validate"):
+                validated = validate_stage(submissions_dir, github_actor)
+            result.submission_type = validated.submission_type
+
+            current = "decrypt"
+            with stage("decrypt"):
+                decrypted = decrypt_stage(validated, private_key)
+            result.team = decrypted.team
+            result.content_hash = decrypted.content_hash
+            print(f"🔐 Decrypted submission for team: {decrypted.team}")
+
+            current = "score"
+            with stage("score"):
+                result.scores = score_stage(decrypted, secrets)
+
+            if update_leaderboard:
+                current = "leaderboard"
+                with stage("leaderboard"):
+                    update_leaderboard_stage(result)
+    except (ValidationError, SubmissionError, ValueError, KeyError, FileNotFoundError) as e:
+        result.failed_stage = current
+        result.error = str(e)
+        print(f"❌ {current} failed: {e}")
+    except Exception as e:
+        # Anything else (malformed CSV values, bad ciphertext, ...) must still
+        # end up in the PR comment and the JSON artifact
+        result.failed_stage = current
+        result.error = f"{type(e).__name__}: {e}"
+        print(f"❌ {current} failed: {result.error}")
+        traceback.print_exc()
+
+    return result
+
+
+# -----------------------------
+# Artifacts
+# -----------------------------
+def format_comment(result):
+    """Markdown body of the PR comment."""
+    comment = "## 📊 Submission Evaluation Results\n\n"
+    comment += f"### {result.team or 'Submission'}\n\n```\n"
+
+    if result.ok:
+        scores = result.scores
+        comment += f"Challenge Accuracy: {scores.challenge_accuracy:.4f}\n"
+        comment += f"Original Accuracy : {scores.original_accuracy:.4f}\n"
+        comment += f"Gap               : {scores.accuracy_gap:.4f}\n"
+    else:
+        comment += f"Evaluation failed during {result.failed_stage}: {result.error}\n"
+
+    comment += "```\n"
+    return comment
+
+
+def write_artifacts(result, results_dir=RESULTS_DIR, stages=None):
+    """Write <team>.json and comment.md; returns the JSON artifact path."""
+    results_dir = Path(results_dir)
+    results_dir.mkdir(parents=True, exist_ok=True)
+
+    artifact = results_dir / f"{result.team or 'submission'}.json"
+    with open(artifact, "w") as f:
+        json.dump(dict(asdict(result), stages=stages or []), f, indent=2)
+
+    with open(results_dir / "comment.md", "w") as f:
+        f.write(format_comment(result))
+
+    # Export outputs for GitHub Actions
+    github_output = os.environ.get("GITHUB_OUTPUT")
+    if github_output:
+        with open(github_output, "a") as f:
+            f.write(f"team_name={result.team or ''}\n")
+            f.write(f"result_path={artifact}\n")
+
+    return artifact
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate, decrypt and score a submission")
+    parser.add_argument("--submissions-dir", default=str(SUBMISSION_DIR),
+                        help="Directory containing the .enc submission and metadata.json")
+    parser.add_argument("--results-dir", default=str(RESULTS_DIR),
+                        help="Where to write <team>.json and comment.md")
+    parser.add_argument("--update-leaderboard", action="store_true",
+                        help="Record the result and regenerate the leaderboard")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also record peak Python heap growth per stage (slower)")
+    args = parser.parse_args()
+
+    with StageRecorder(trace_memory=args.trace_memory) as recorder:
+        result = run_pipeline(args.submissions_dir, update_leaderboard=args.update_leaderboard)
+
+    artifact = write_artifacts(result, args.results_dir, recorder.records)
+    print(f"Saved results to {artifact}")
+
+    return 0 if result.ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+Append-only history of every scored submission.
+
+Each row stores the team, a SHA-256 of the submitted predictions, all metrics,
+the submission time and the submission_type from metadata.json. The history is
+kept in SQLite with indexes on team, time and submission type, so the common
+queries (best per team as of a date, all submissions of one type, score trend
+of one team) are index lookups instead of full scans.
+
+The best-per-team leaderboard is a materialized view: the `best_per_team`
+table is maintained by a trigger on every insert and is never written to
+directly.
+"""
+import hashlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_DB = Path(__file__).parent.parent / 'submission_history.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id                 INTEGER PRIMARY KEY AUTOINCREMENT,
+    team               TEXT NOT NULL,
+    content_hash       TEXT NOT NULL,
+    challenge_accuracy REAL NOT NULL,
+    original_accuracy  REAL NOT NULL,
+    accuracy_gap       REAL NOT NULL,
+    submission_type    TEXT,
+    timestamp          TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_submissions_team_time
+    ON submissions (team, timestamp);
+CREATE INDEX IF NOT EXISTS idx_submissions_time
+    ON submissions (timestamp);
+CREATE INDEX IF NOT EXISTS idx_submissions_type_time
+    ON submissions (submission_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_submissions_hash
+    ON submissions (content_hash);
+-- Best submission of one team as of a date is the first row of this index
+-- at or before that date
+CREATE INDEX IF NOT EXISTS idx_submissions_team_score
+    ON submissions (team, challenge_accuracy DESC, timestamp, id);
+
+CREATE TRIGGER IF NOT EXISTS submissions_no_update
+BEFORE UPDATE ON submissions
+BEGIN
+    SELECT RAISE(ABORT, 'submission history is append-only');
+END;
+
+CREATE TRIGGER IF NOT EXISTS submissions_no_delete
+BEFORE DELETE ON submissions
+BEGIN
+    SELECT RAISE(ABORT, 'submission history is append-only');
+END;
+
+-- Materialized best-per-team view. Ties keep the earlier submission.
+CREATE TABLE IF NOT EXISTS best_per_team (
+    team               TEXT PRIMARY KEY,
+    submission_id      INTEGER NOT NULL REFERENCES submissions (id),
+    content_hash       TEXT NOT NULL,
+    challenge_accuracy REAL NOT NULL,
+    original_accuracy  REAL NOT NULL,
+    accuracy_gap       REAL NOT NULL,
+    submission_type    TEXT,
+    timestamp          TEXT NOT NULL,
+    submission_count   INTEGER NOT NULL,
+    last_submission    TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_best_per_team_score
+    ON best_per_team (challenge_accuracy DESC, timestamp);
+
+CREATE TRIGGER IF NOT EXISTS best_per_team_refresh
+AFTER INSERT ON submissions
+BEGIN
+    INSERT INTO best_per_team (
+        team, submission_id, content_hash, challenge_accuracy,
+        original_accuracy, accuracy_gap, submission_type, timestamp,
+        submission_count, last_submission
+    )
+    VALUES (
+        NEW.team, NEW.id, NEW.content_hash, NEW.challenge_accuracy,
+        NEW.original_accuracy, NEW.accuracy_gap, NEW.submission_type,
+        NEW.timestamp, 1, NEW.timestamp
+    )
+    ON CONFLICT (team) DO UPDATE SET
+        submission_count = submission_count + 1,
+        last_submission = MAX(last_submission, excluded.last_submission),
+        submission_id = CASE WHEN excluded.challenge_accuracy > challenge_accuracy
+                             THEN excluded.submission_id ELSE submission_id END,
+        content_hash = CASE WHEN excluded.challenge_accuracy > challenge_accuracy
+                            THEN excluded.content_hash ELSE content_hash END,
+        original_accuracy = CASE WHEN excluded.challenge_accuracy > challenge_accuracy
+                                 THEN excluded.original_accuracy ELSE original_accuracy END,
+        accuracy_gap = CASE WHEN excluded.challenge_accuracy > challenge_accuracy
+                            THEN excluded.accuracy_gap ELSE accuracy_gap END,
+        submission_type = CASE WHEN excluded.challenge_accuracy > challenge_accuracy
+                               THEN excluded.submission_type ELSE submission_type END,
+        timestamp = CASE WHEN excluded.challenge_accuracy > challenge_accuracy
+                         THEN excluded.timestamp ELSE timestamp END,
+        challenge_accuracy = MAX(challenge_accuracy, excluded.challenge_accuracy);
+END;
+"""
+
+COLUMNS = (
+    "id", "team", "content_hash", "challenge_accuracy", "original_accuracy",
+    "accuracy_gap", "submission_type", "timestamp"
+)
+
+
+def content_hash(data):
+    """SHA-256 of submission content (bytes) or of a submission file (path)."""
+    if isinstance(data, (str, Path)):
+        with open(data, "rb") as f:
+            data = f.read()
+    return hashlib.sha256(data).hexdigest()
+
+
+def _as_of_bound(as_of):
+    """
+    Normalize an `as_of` bound to an ISO string comparable with stored
+    timestamps. A bare date (YYYY-MM-DD) includes the whole day.
+    """
+    if isinstance(as_of, datetime):
+        return as_of.isoformat()
+    if len(as_of) == 10:
+        return f"{as_of}T23:59:59.999999"
+    return as_of
+
+
+class SubmissionHistory:
+    """SQLite-backed, append-only store of scored submissions."""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM submissions").fetchone()[0]
+
+    # ----------------------------
+    # Writes
+    # ----------------------------
+    def record(self, team, scores, content_hash, submission_type=None, timestamp=None):
+        """
+        Append one scored submission. `scores` is the dict returned by
+        scoring_script.evaluate. Returns the new row id.
+        """
+        timestamp = timestamp or datetime.now().isoformat()
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO submissions (team, content_hash, challenge_accuracy, "
+                "original_accuracy, accuracy_gap, submission_type, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    team,
+                    content_hash,
+                    float(scores["challenge_accuracy"]),
+                    float(scores["original_accuracy"]),
+                    float(scores["accuracy_gap"]),
+                    submission_type,
+                    timestamp,
+                )
+            )
+        return cursor.lastrowid
+
+    def import_leaderboard(self, leaderboard):
+        """
+        Seed an empty store from a legacy leaderboard.json, which only kept
+        each team's best result. Content hashes of those results are unknown.
+        """
+        if len(self):
+            return 0
+
+        entries = sorted(
+            leaderboard.get("submissions", []),
+            key=lambda sub: sub.get("timestamp") or ""
+        )
+        for sub in entries:
+            self.record(
+                sub["team"],
+                {
+                    "challenge_accuracy": sub["challenge_accuracy"],
+                    "original_accuracy": sub["original_accuracy"],
+                    "accuracy_gap": sub.get("gap", sub.get("accuracy_gap", 0.0)),
+                },
+                content_hash="",
+                timestamp=sub.get("timestamp") or datetime.now().isoformat()
+            )
+        return len(entries)
+
+    # ----------------------------
+    # Queries
+    # ----------------------------
+    def best_per_team(self, as_of=None):
+        """
+        Best submission of every team, ordered by challenge accuracy (ties:
+        earlier submission first). Without `as_of` this reads the materialized
+        view; with it, only submissions up to `as_of` are considered.
+        """
+        if as_of is None:
+            rows = self.conn.execute(
+                "SELECT submission_id AS id, team, content_hash, challenge_accuracy, "
+                "original_accuracy, accuracy_gap, submission_type, timestamp, "
+                "submission_count, last_submission "
+                "FROM best_per_team ORDER BY challenge_accuracy DESC, timestamp"
+            )
+            return [dict(row) for row in rows]
+
+        # One index seek per team (the teams come from the materialized view)
+        # instead of sorting every submission up to `as_of`
+        rows = self.conn.execute(
+            f"SELECT {', '.join('s.' + column for column in COLUMNS)}, "
+            "  (SELECT COUNT(*) FROM submissions c"
+            "   WHERE c.team = t.team AND c.timestamp <= :as_of) AS submission_count,"
+            "  (SELECT MAX(c.timestamp) FROM submissions c"
+            "   WHERE c.team = t.team AND c.timestamp <= :as_of) AS last_submission "
+            "FROM best_per_team t JOIN submissions s ON s.id = ("
+            "  SELECT b.id FROM submissions b INDEXED BY idx_submissions_team_score"
+            "  WHERE b.team = t.team AND b.timestamp <= :as_of"
+            "  ORDER BY b.challenge_accuracy DESC, b.timestamp, b.id LIMIT 1"
+            ") ORDER BY s.challenge_accuracy DESC, s.timestamp",
+            {"as_of": _as_of_bound(as_of)}
+        )
+        return [dict(row) for row in rows]
+
+    def by_submission_type(self, submission_type):
+        """All submissions of one submission_type, oldest first."""
+        rows = self.conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM submissions "
+            "WHERE submission_type = ? ORDER BY timestamp",
+            (submission_type,)
+        )
+        return [dict(row) for row in rows]
+
+    def team_trend(self, team, since=None):
+        """Every submission of one team, oldest first."""
+        rows = self.conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM submissions "
+            "WHERE team = ? AND timestamp >= ? ORDER BY timestamp",
+            (team, since or "")
+        )
+        return [dict(row) for row in rows]
+
+    def find_by_hash(self, content_hash):
+        """Submissions (of any team) with identical predictions."""
+        rows = self.conn.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM submissions "
+            "WHERE content_hash = ? ORDER BY timestamp",
+            (content_hash,)
+        )
+        return [dict(row) for row in rows]
+
+    def has_submission(self, team, content_hash, scores=None):
+        """
+        Whether `team` already has a submission with this content hash (and,
+        if given, the same challenge and original accuracy in `scores`).
+        """
+        query = "SELECT 1 FROM submissions WHERE team = ? AND content_hash = ?"
+        params = [team, content_hash]
+        if scores is not None:
+            query += " AND challenge_accuracy = ? AND original_accuracy = ?"
+            params += [float(scores["challenge_accuracy"]), float(scores["original_accuracy"])]
+        return self.conn.execute(query + " LIMIT 1", params).fetchone() is not None
+
+    def leaderboard(self, as_of=None):
+        """
+        Kaggle-style leaderboard (standard competition ranking) derived from
+        the best-per-team view, in the leaderboard.json entry format.
+        """
+        submissions = []
+        rank = 0
+        previous_score = None
+
+        for index, best in enumerate(self.best_per_team(as_of)):
+            score = best["challenge_accuracy"]
+            if previous_score is None or score < previous_score:
+                rank = index + 1
+            previous_score = score
+
+            submissions.append({
+                "team": best["team"],
+                "challenge_accuracy": score,
+                "original_accuracy": best["original_accuracy"],
+                "gap": best["accuracy_gap"],
+                "timestamp": best["timestamp"],
+                "submission_type": best["submission_type"],
+                "submission_count": best["submission_count"],
+                "last_submission": best["last_submission"],
+                "rank": rank
+            })
+
+        return submissions
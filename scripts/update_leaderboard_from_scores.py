@@ -1,109 +1,86 @@
 """
 Update leaderboard from scores file (Kaggle-style ranking).
+
+Every scored line is appended to the submission history store; the leaderboard
+is then derived from the store's best-per-team view.
 """
 
 import json
 import sys
 from pathlib import Path
-from datetime import datetime
-
-# ----------------------------
-# Load existing leaderboard
-# ----------------------------
-leaderboard_file = Path("leaderboard.json")
-
-if leaderboard_file.exists():
-    with open(leaderboard_file, "r") as f:
-        leaderboard = json.load(f)
-else:
-    leaderboard = {
-        "last_updated": None,
-        "submissions": []
-    }
-
-existing_map = {
-    sub["team"]: sub for sub in leaderboard.get("submissions", [])
-}
-
-# ----------------------------
-# Load new scores
-# ----------------------------
-scores_file = Path("results/scores.txt")
-
-if not scores_file.exists():
-    print("No scores file found")
-    sys.exit(1)
-
-with open(scores_file, "r") as f:
-    for line in f:
-        parts = line.strip().split(":")
-
-        if len(parts) != 4:
-            print(f"Skipping malformed line: {line.strip()}")
-            continue
-
-        team = parts[0]
-        challenge_acc = float(parts[1])
-        original_acc = float(parts[2])
-        gap = float(parts[3])
-
-        # Safety check
-        computed_gap = abs(challenge_acc - original_acc)
-        if abs(gap - computed_gap) > 1e-6:
-            print(f"Warning: gap mismatch for team {team}, using computed gap")
-            gap = computed_gap
-
-        entry = {
-            "team": team,
+
+from generate_leaderboard import open_history, save_leaderboard
+
+
+def load_submission_type(metadata_file=Path("submissions/metadata.json")):
+    """submission_type from metadata.json, or None if unavailable."""
+    if metadata_file.exists():
+        with open(metadata_file, "r") as f:
+            return json.load(f).get("submission_type")
+    return None
+
+
+def record_scores(history, team, scores, submission_hash, submission_type):
+    """Append one scored submission to the history."""
+    challenge_acc = float(scores["challenge_accuracy"])
+    original_acc = float(scores["original_accuracy"])
+    gap = float(scores["accuracy_gap"])
+
+    # Safety check
+    computed_gap = abs(challenge_acc - original_acc)
+    if abs(gap - computed_gap) > 1e-6:
+        print(f"Warning: gap mismatch for team {team}, using computed gap")
+        gap = computed_gap
+
+    history.record(
+        team,
+        {
             "challenge_accuracy": challenge_acc,
             "original_accuracy": original_acc,
-            "gap": gap,
-            "timestamp": datetime.now().isoformat()
-        }
-
-        # Keep BEST challenge accuracy only
-        if (
-            team not in existing_map
-            or challenge_acc > existing_map[team]["challenge_accuracy"]
-        ):
-            existing_map[team] = entry
-            print(f"Updated entry for {team}: challenge_accuracy={challenge_acc:.6f}")
-
-# ----------------------------
-# Convert to list and sort
-# ----------------------------
-submissions = list(existing_map.values())
-
-# Sort by challenge accuracy descending
-# If tie, earlier submission wins (stable ranking)
-submissions.sort(
-    key=lambda x: (-x["challenge_accuracy"], x["timestamp"])
-)
-
-# ----------------------------
-# Kaggle Ranking (Standard Competition Ranking)
-# ----------------------------
-rank = 0
-previous_score = None
-
-for index, sub in enumerate(submissions):
-    score = sub["challenge_accuracy"]
-
-    if previous_score is None or score < previous_score:
-        rank = index + 1
-
-    sub["rank"] = rank
-    previous_score = score
-
-# ----------------------------
-# Save leaderboard
-# ----------------------------
-leaderboard = {
-    "last_updated": datetime.now().isoformat(),
-    "submissions": submissions
-}
-
-with open(leaderboard_file, "w") as f:
-    json.dump(leaderboard, f, indent=2)
-
-print(f"Leaderboard updated with {len(submissions)} team(s)")
+            "accuracy_gap": gap
+        },
+        submission_hash,
+        submission_type
+    )
+    print(f"Recorded submission for {team}: challenge_accuracy={challenge_acc:.6f}")
+
+
+def main():
+    submission_type = load_submission_type()
+
+    # ----------------------------
+    # Load new scores
+    # ----------------------------
+    scores_file = Path("results/scores.txt")
+
+    if not scores_file.exists():
+        print("No scores file found")
+        sys.exit(1)
+
+    with open_history() as history, open(scores_file, "r") as f:
+        for line in f:
+            # team:challenge:original:gap[:content_hash]
+            parts = line.strip().split(":")
+
+            if len(parts) not in (4, 5):
+                print(f"Skipping malformed line: {line.strip()}")
+                continue
+
+            scores = {
+                "challenge_accuracy": float(parts[1]),
+                "original_accuracy": float(parts[2]),
+                "accuracy_gap": float(parts[3])
+            }
+            submission_hash = parts[4] if len(parts) == 5 else ""
+            record_scores(history, parts[0], scores, submission_hash, submission_type)
+
+        # ----------------------------
+        # Save leaderboard (best per team, Kaggle ranking)
+        # ----------------------------
+        leaderboard = save_leaderboard(history)
+
+    print(f"Leaderboard updated with {len(leaderboard['submissions'])} team(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,14 @@ from pathlib import Path
 class SubmissionError(Exception):
     pass
 
-def validate():
-    repo_root = Path(__file__).parent.parent
-    submissions_dir = repo_root / "submissions"
+def validate(submissions_dir=None, github_actor=None):
+    """
+    Check the submission layout and metadata.json.
+    Returns (enc_file, metadata) for the single valid submission.
+    """
+    if submissions_dir is None:
+        submissions_dir = Path(__file__).parent.parent / "submissions"
+    submissions_dir = Path(submissions_dir)
 
     if not submissions_dir.exists():
         raise SubmissionError("submissions/ directory not found.")
@@ -26,7 +31,8 @@ def validate():
     team_name = enc_file.stem.lower()
 
     # 2️⃣ Filename must match GitHub username
-    github_actor = os.environ.get("GITHUB_ACTOR")
+    if github_actor is None:
+        github_actor = os.environ.get("GITHUB_ACTOR")
 
     if not github_actor:
         raise SubmissionError("GITHUB_ACTOR not found in environment.")
@@ -64,6 +70,8 @@ def validate():
 
     print("✅ Submission structure validated successfully.")
 
+    return enc_file, metadata
+
 if __name__ == "__main__":
     try:
         validate()
@@ -0,0 +1,198 @@
+"""
+Graph augmentation (DropEdge and feature masking) generated off the
+training loop's critical path.
+
+GraphAugmenter precomputes the undirected edge list, self loops and the
+full graph's GCN normalization once. Each augmented view then costs a
+handful of vectorized ops: a Bernoulli keep-mask over undirected edges
+(both directions are dropped together), a bincount for the new degrees,
+the D^-1/2 (A + I) D^-1/2 edge weights, and a Bernoulli mask over feature
+columns. Views are produced by a background thread into a bounded queue,
+so training only pays for a queue get; torch releases the GIL inside
+these ops, so production overlaps the forward/backward pass when cores
+are available.
+
+The baseline GCN consumes the views with normalize=False, skipping its own
+per-forward gcn_norm:
+
+    augmenter = GraphAugmenter(data.x, data.edge_index, drop_edge=0.2, mask_feature=0.2)
+    model = GCN(data.x.size(1), 16, num_classes, normalize=False)
+    with augmenter.stream(epochs=100) as views:
+        train(model, data, views=views)
+    data.edge_index, data.edge_weight = augmenter.full_graph
+
+The column mask is shared by every node, so x itself is never rewritten:
+GCN applies it to the input columns of its first weight instead,
+(x * m) @ W.T == x @ (W * m).T, which costs F x hidden per epoch rather
+than an N x F copy. Augmented views cost about as much as the
+non-augmented loop.
+
+Run as a script to compare per-epoch time and accuracy with and without
+augmentation:
+
+    python starter_code/augmentation.py
+"""
+import argparse
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import torch
+
+DROP_EDGE = 0.2
+MASK_FEATURE = 0.2
+PREFETCH = 4
+
+_DONE = object()
+
+
+class GraphAugmenter:
+    def __init__(self, x, edge_index, drop_edge=DROP_EDGE, mask_feature=MASK_FEATURE, seed=0):
+        self.x = x
+        self.num_nodes = x.size(0)
+        self.drop_edge = drop_edge
+        self.mask_feature = mask_feature
+        self.generator = torch.Generator(device="cpu").manual_seed(seed)
+
+        # Undirected pairs (u < v), self loops removed, duplicates merged
+        u, v = edge_index.cpu()
+        u, v = torch.minimum(u, v), torch.maximum(u, v)
+        pairs = torch.unique(torch.stack([u, v])[:, u != v], dim=1)
+        self.pairs = pairs.to(x.device)
+        self.loops = torch.arange(self.num_nodes, device=x.device)
+
+        self.full_graph = self.normalize(None)
+
+    def normalize(self, keep):
+        """
+        Symmetric edge_index with self loops and GCN edge weights for the
+        undirected pairs selected by `keep` (all pairs if None).
+        """
+        u, v = self.pairs if keep is None else self.pairs[:, keep]
+        src = torch.cat([u, v, self.loops])
+        dst = torch.cat([v, u, self.loops])
+        deg = torch.bincount(dst, minlength=self.num_nodes).to(self.x.dtype)
+        deg_inv_sqrt = deg.pow(-0.5)
+        return torch.stack([src, dst]), deg_inv_sqrt[src] * deg_inv_sqrt[dst]
+
+    def sample(self):
+        """
+        One augmented (x, edge_index, edge_weight, feature_mask) view. x is
+        the unmodified feature matrix; feature_mask (None without masking)
+        is a 0/1 vector over its columns, applied by GCN to its first weight.
+        """
+        if self.drop_edge > 0:
+            keep = torch.rand(self.pairs.size(1), generator=self.generator) >= self.drop_edge
+            edge_index, edge_weight = self.normalize(keep.to(self.pairs.device))
+        else:
+            edge_index, edge_weight = self.full_graph
+
+        feature_mask = None
+        if self.mask_feature > 0:
+            columns = torch.rand(self.x.size(1), generator=self.generator) >= self.mask_feature
+            feature_mask = columns.to(self.x.device, self.x.dtype)
+        return self.x, edge_index, edge_weight, feature_mask
+
+    @contextmanager
+    def stream(self, epochs, prefetch=PREFETCH):
+        """
+        Iterator over `epochs` views produced by a background thread into a
+        queue of at most `prefetch` views. Errors in the worker are raised in
+        the consumer.
+        """
+        views = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    views.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def worker():
+            try:
+                for _ in range(epochs):
+                    if not put(self.sample()):
+                        return
+                put(_DONE)
+            except BaseException as e:
+                put(e)
+
+        def consume():
+            while True:
+                item = views.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        try:
+            yield consume()
+        finally:
+            stop.set()
+            thread.join()
+
+
+# -----------------------------
+# Timing comparison
+# -----------------------------
+def main():
+    from baseline import DATA_PATH, GCN, evaluate, train
+    from feature_projection import add_rank_argument, load_projected
+
+    parser = argparse.ArgumentParser(description="Per-epoch cost of background graph augmentation")
+    parser.add_argument("--data", default=DATA_PATH)
+    add_rank_argument(parser)
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--seeds", type=int, default=3)
+    parser.add_argument("--drop-edge", type=float, default=DROP_EDGE)
+    parser.add_argument("--mask-feature", type=float, default=MASK_FEATURE)
+    parser.add_argument("--prefetch", type=int, default=PREFETCH)
+    args = parser.parse_args()
+
+    data = load_projected(args.data, args.rank, args.projection)
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    data = data.to(device)
+    num_classes = int(data.y.max().item() + 1)
+
+    def synchronous(augmenter):
+        while True:
+            yield augmenter.sample()
+
+    settings = ["baseline", "cached norm", "augment (inline)", "augment (background)"]
+    print(f"{'setting':<22}{'ms/epoch':>10}{'val acc':>10}")
+    for setting in settings:
+        seconds, accuracies = [], []
+        for seed in range(args.seeds):
+            torch.manual_seed(seed)
+            augmenter = GraphAugmenter(data.x, data.edge_index, args.drop_edge, args.mask_feature, seed)
+            eval_data = data.clone()
+            normalize = setting == "baseline"
+            if not normalize:
+                eval_data.edge_index, eval_data.edge_weight = augmenter.full_graph
+            model = GCN(data.x.size(1), 16, num_classes, normalize=normalize).to(device)
+
+            start = time.perf_counter()
+            if setting == "augment (background)":
+                with augmenter.stream(args.epochs, args.prefetch) as views:
+                    train(model, eval_data, epochs=args.epochs, verbose=False, views=views)
+            elif setting == "augment (inline)":
+                train(model, eval_data, epochs=args.epochs, verbose=False, views=synchronous(augmenter))
+            else:
+                train(model, eval_data, epochs=args.epochs, verbose=False)
+            seconds.append(time.perf_counter() - start)
+            accuracies.append(evaluate(model, eval_data)["challenge"])
+
+        print(f"{setting:<22}{sum(seconds) / len(seconds) / args.epochs * 1000:>10.2f}"
+              f"{sum(accuracies) / len(accuracies):>10.4f}")
+
+
+if __name__ == '__main__':
+    main()
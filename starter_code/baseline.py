@@ -1,3 +1,5 @@
+import argparse
+
 import torch
 import torch.nn.functional as F
 from torch_geometric.nn import GCNConv
@@ -7,57 +9,117 @@ from torch_geometric.data import Data
 # Load public data
 # -----------------------------
 DATA_PATH = "data/citeseer_challenge_public.pt"
-data = torch.load(DATA_PATH)
+
+
+def load_data(path=DATA_PATH):
+    data = torch.load(path, weights_only=False)
+    # The public file holds a one-element list
+    if isinstance(data, (list, tuple)):
+        data = data[0]
+    return data
+
 
 # -----------------------------
 # Simple 2-layer GCN
 # -----------------------------
 class GCN(torch.nn.Module):
-    def __init__(self, in_channels, hidden_channels, out_channels):
+    def __init__(self, in_channels, hidden_channels, out_channels, normalize=True):
         super().__init__()
-        self.conv1 = GCNConv(in_channels, hidden_channels)
-        self.conv2 = GCNConv(hidden_channels, out_channels)
+        # normalize=False expects edge_index with self loops and precomputed
+        # normalized edge weights (see augmentation.py)
+        self.conv1 = GCNConv(in_channels, hidden_channels, normalize=normalize)
+        self.conv2 = GCNConv(hidden_channels, out_channels, normalize=normalize)
 
-    def forward(self, x, edge_index):
-        x = self.conv1(x, edge_index)
+    def forward(self, x, edge_index, edge_weight=None, feature_mask=None):
+        if feature_mask is None:
+            x = self.conv1(x, edge_index, edge_weight)
+        else:
+            # Masking feature columns of x is masking input columns of the
+            # first weight: (x * m) @ W.T == x @ (W * m).T, an F x hidden op
+            weight = self.conv1.lin.weight * feature_mask
+            x = torch.func.functional_call(self.conv1, {"lin.weight": weight},
+                                           (x, edge_index, edge_weight))
         x = F.relu(x)
         x = F.dropout(x, p=0.5, training=self.training)
-        x = self.conv2(x, edge_index)
+        x = self.conv2(x, edge_index, edge_weight)
         return x
 
-device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-data = data.to(device)
-model = GCN(in_channels=data.x.size(1), hidden_channels=16, out_channels=int(data.y.max().item()+1)).to(device)
-optimizer = torch.optim.Adam(model.parameters(), lr=0.01, weight_decay=5e-4)
+
+def graph_inputs(data, x=None):
+    """Model inputs: (x, edge_index) plus data.edge_weight when it is set."""
+    x = data.x if x is None else x
+    edge_weight = getattr(data, "edge_weight", None)
+    return (x, data.edge_index) if edge_weight is None else (x, data.edge_index, edge_weight)
+
 
 # -----------------------------
 # Training loop
 # -----------------------------
-model.train()
-for epoch in range(100):
-    optimizer.zero_grad()
-    out = model(data.x, data.edge_index)
-    loss = F.cross_entropy(out[data.train_mask_challange], data.y[data.train_mask_challange])
-    loss.backward()
-    optimizer.step()
-    if (epoch+1) % 20 == 0:
-        print(f"Epoch {epoch+1}, Loss: {loss.item():.4f}")
+def train(model, data, x=None, epochs=100, lr=0.01, weight_decay=5e-4, verbose=True, views=None):
+    """
+    Full-batch training on train_mask_challange. `x` overrides data.x;
+    `views` yields one (x, edge_index, edge_weight, feature_mask) per epoch
+    instead, e.g. augmented graphs (see augmentation.py).
+    """
+    graph = graph_inputs(data, x)
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr, weight_decay=weight_decay)
+    model.train()
+    for epoch in range(epochs):
+        optimizer.zero_grad()
+        out = model(*(next(views) if views is not None else graph))
+        loss = F.cross_entropy(out[data.train_mask_challange], data.y[data.train_mask_challange])
+        loss.backward()
+        optimizer.step()
+        if verbose and (epoch+1) % 20 == 0:
+            print(f"Epoch {epoch+1}, Loss: {loss.item():.4f}")
+    return model
+
 
 # -----------------------------
 # Evaluation
 # -----------------------------
-model.eval()
-with torch.no_grad():
-    logits = model(data.x, data.edge_index)
-    preds = logits.argmax(dim=1)
+@torch.no_grad()
+def predict(model, data, x=None):
+    model.eval()
+    logits = model(*graph_inputs(data, x))
+    return logits.argmax(dim=1)
+
+
+def evaluate(model, data, x=None):
+    """Validation accuracy on the challenge and the original split."""
+    preds = predict(model, data, x)
+
+    # Challenge validation
+    val_challenge_mask = data.val_mask_challange
+    acc_challenge = (preds[val_challenge_mask] == data.y[val_challenge_mask]).float().mean().item()
+
+    # Normal/causal validation
+    val_mask = data.val_mask
+    acc_original = (preds[val_mask] == data.y[val_mask]).float().mean().item()
+
+    return {"challenge": acc_challenge, "original": acc_original}
+
+
+def main():
+    from feature_projection import add_rank_argument, load_projected
+
+    parser = argparse.ArgumentParser(description="Train the baseline GCN")
+    parser.add_argument("--data", default=DATA_PATH)
+    add_rank_argument(parser)
+    args = parser.parse_args()
+
+    data = load_projected(args.data, args.rank, args.projection)
+
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    data = data.to(device)
+    model = GCN(in_channels=data.x.size(1), hidden_channels=16, out_channels=int(data.y.max().item()+1)).to(device)
+
+    train(model, data)
+    acc = evaluate(model, data)
 
-# Challenge validation
-val_challenge_mask = data.val_mask_challange
-acc_challenge = (preds[val_challenge_mask] == data.y[val_challenge_mask]).float().mean().item()
+    print(f"Validation Accuracy (Challenge): {acc['challenge']:.4f}")
+    print(f"Validation Accuracy (Original): {acc['original']:.4f}")
 
-# Normal/causal validation
-val_mask = data.val_mask
-acc_original = (preds[val_mask] == data.y[val_mask]).float().mean().item()
 
-print(f"Validation Accuracy (Challenge): {acc_challenge:.4f}")
-print(f"Validation Accuracy (Original): {acc_original:.4f}")
+if __name__ == '__main__':
+    main()
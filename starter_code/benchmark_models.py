@@ -0,0 +1,384 @@
+"""
+Accuracy-versus-cost benchmark of standard node classifiers on the challenge
+split.
+
+Every model (MLP, GCN, SGC, GraphSAGE, GAT, label propagation) is trained
+with the baseline's loop over several seeds, and for each one we record
+challenge/original validation accuracy, training time, inference latency,
+peak memory and parameter count. Each model runs in a fresh process, so its
+peak memory does not depend on what the allocator kept from the models
+benchmarked before it. Models on the accuracy/train-time Pareto
+front are marked.
+
+Results are written as JSON and can be compared against a stored baseline
+results file; accuracy drops or slowdowns beyond the tolerances are
+reported as regressions (exit code 1).
+
+Usage:
+    python starter_code/benchmark_models.py --output results/models.json
+    python starter_code/benchmark_models.py --save-baseline        # store a reference
+    python starter_code/benchmark_models.py --baseline starter_code/benchmark_baseline.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import threading
+import time
+from pathlib import Path
+
+import torch
+import torch.nn.functional as F
+from torch_geometric.nn import GATConv, SAGEConv, SGConv
+from torch_geometric.nn.models import LabelPropagation
+
+from baseline import DATA_PATH, GCN, evaluate, train
+from feature_projection import add_rank_argument, load_projected
+
+BASELINE_PATH = Path(__file__).parent / "benchmark_baseline.json"
+
+HIDDEN = 16
+ACCURACY_TOLERANCE = 0.02   # absolute drop in mean accuracy
+SLOWDOWN_TOLERANCE = 1.5    # ratio of train time / inference latency
+
+
+# -----------------------------
+# Models
+# -----------------------------
+class MLP(torch.nn.Module):
+    def __init__(self, in_channels, hidden_channels, out_channels):
+        super().__init__()
+        self.lin1 = torch.nn.Linear(in_channels, hidden_channels)
+        self.lin2 = torch.nn.Linear(hidden_channels, out_channels)
+
+    def forward(self, x, edge_index):
+        x = F.relu(self.lin1(x))
+        x = F.dropout(x, p=0.5, training=self.training)
+        return self.lin2(x)
+
+
+class SGC(torch.nn.Module):
+    def __init__(self, in_channels, hidden_channels, out_channels, K=2):
+        super().__init__()
+        # The graph is fixed, so A^K X is computed once and cached
+        self.conv = SGConv(in_channels, out_channels, K=K, cached=True)
+
+    def forward(self, x, edge_index):
+        return self.conv(x, edge_index)
+
+
+class SAGE(torch.nn.Module):
+    def __init__(self, in_channels, hidden_channels, out_channels):
+        super().__init__()
+        self.conv1 = SAGEConv(in_channels, hidden_channels)
+        self.conv2 = SAGEConv(hidden_channels, out_channels)
+
+    def forward(self, x, edge_index):
+        x = F.relu(self.conv1(x, edge_index))
+        x = F.dropout(x, p=0.5, training=self.training)
+        return self.conv2(x, edge_index)
+
+
+class GAT(torch.nn.Module):
+    def __init__(self, in_channels, hidden_channels, out_channels, heads=8):
+        super().__init__()
+        self.conv1 = GATConv(in_channels, hidden_channels // 2, heads=heads, dropout=0.6)
+        self.conv2 = GATConv(hidden_channels // 2 * heads, out_channels, heads=1, dropout=0.6)
+
+    def forward(self, x, edge_index):
+        x = F.dropout(x, p=0.6, training=self.training)
+        x = F.elu(self.conv1(x, edge_index))
+        x = F.dropout(x, p=0.6, training=self.training)
+        return self.conv2(x, edge_index)
+
+
+class LabelProp(torch.nn.Module):
+    """Label propagation from the training labels; nothing to train."""
+
+    def __init__(self, train_y, train_mask, num_layers=50, alpha=0.9):
+        super().__init__()
+        self.train_y = train_y
+        self.train_mask = train_mask
+        self.propagate = LabelPropagation(num_layers=num_layers, alpha=alpha)
+
+    def forward(self, x, edge_index):
+        return self.propagate(self.train_y, edge_index, mask=self.train_mask)
+
+
+MODELS = {
+    "mlp": MLP,
+    "gcn": GCN,
+    "sgc": SGC,
+    "sage": SAGE,
+    "gat": GAT,
+    "label_propagation": None,  # built from the data, see build_model
+}
+
+
+def build_model(name, data, num_classes):
+    if name == "label_propagation":
+        # Unlabeled nodes get a placeholder class; the mask hides them
+        train_y = data.y.clamp(min=0)
+        return LabelProp(train_y, data.train_mask_challange)
+    return MODELS[name](data.x.size(1), HIDDEN, num_classes)
+
+
+# -----------------------------
+# Measurement
+# -----------------------------
+def _current_rss_bytes():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows: no procfs and no resource, memory is not measured
+    # No procfs (macOS): fall back to the process-wide peak
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if platform.system() == "Darwin" else rss * 1024
+
+
+class PeakMemory:
+    """
+    Peak memory growth during the block: CUDA allocator peak on GPU, sampled
+    resident set size on CPU (None where RSS cannot be read). RSS growth
+    only counts memory the process did not already hold, so compare models
+    measured in fresh processes.
+    """
+
+    def __init__(self, device, interval=0.001):
+        self.device = device
+        self.interval = interval
+        self.peak_bytes = 0
+
+    def __enter__(self):
+        if self.device.type == "cuda":
+            torch.cuda.synchronize(self.device)
+            torch.cuda.reset_peak_memory_stats(self.device)
+            self._start = torch.cuda.memory_allocated(self.device)
+            return self
+
+        self._start = self._peak = _current_rss_bytes()
+        if self._start is None:
+            self.peak_bytes = None
+            return self
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self._peak = max(self._peak, _current_rss_bytes())
+
+    def __exit__(self, *exc):
+        if self.device.type == "cuda":
+            torch.cuda.synchronize(self.device)
+            self.peak_bytes = torch.cuda.max_memory_allocated(self.device) - self._start
+            return
+        if self._start is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self._peak, _current_rss_bytes()) - self._start
+
+
+def _sync(device):
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+
+@torch.no_grad()
+def inference_latency(model, data, device, repeats):
+    """Median seconds of a full-graph forward pass (after one warm-up)."""
+    model.eval()
+    model(data.x, data.edge_index)
+    timings = []
+    for _ in range(repeats):
+        _sync(device)
+        start = time.perf_counter()
+        model(data.x, data.edge_index)
+        _sync(device)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run_model(name, data, seeds, epochs, device, repeats):
+    """Metrics of one model over all seeds."""
+    num_classes = int(data.y.max().item() + 1)
+    runs = []
+    for seed in seeds:
+        torch.manual_seed(seed)
+        model = build_model(name, data, num_classes).to(device)
+
+        with PeakMemory(device) as memory:
+            _sync(device)
+            start = time.perf_counter()
+            if any(p.requires_grad for p in model.parameters()):
+                train(model, data, epochs=epochs, verbose=False)
+            _sync(device)
+            train_seconds = time.perf_counter() - start
+            latency = inference_latency(model, data, device, repeats)
+
+        accuracy = evaluate(model, data)
+        runs.append({
+            "seed": seed,
+            "val_challenge_accuracy": accuracy["challenge"],
+            "val_original_accuracy": accuracy["original"],
+            "train_seconds": train_seconds,
+            "inference_seconds": latency,
+            "peak_memory_bytes": memory.peak_bytes,
+        })
+
+    def mean(key):
+        return statistics.fmean(r[key] for r in runs)
+
+    def std(key):
+        return statistics.pstdev(r[key] for r in runs)
+
+    return {
+        "parameters": sum(p.numel() for p in model.parameters()),
+        "val_challenge_accuracy": mean("val_challenge_accuracy"),
+        "val_challenge_accuracy_std": std("val_challenge_accuracy"),
+        "val_original_accuracy": mean("val_original_accuracy"),
+        "val_original_accuracy_std": std("val_original_accuracy"),
+        "train_seconds": mean("train_seconds"),
+        "inference_seconds": mean("inference_seconds"),
+        "peak_memory_bytes": max((r["peak_memory_bytes"] for r in runs
+                                  if r["peak_memory_bytes"] is not None), default=None),
+        "runs": runs,
+    }
+
+
+def _run_isolated(name, path, rank, projection, seeds, epochs, repeats):
+    """run_model() on freshly loaded data; the body of each worker process."""
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    data = load_projected(path, rank, projection).to(device)
+    return run_model(name, data, seeds, epochs, device, repeats)
+
+
+
+def mark_pareto(models):
+    """Flag models no other model beats on both challenge accuracy and train time."""
+    for name, m in models.items():
+        m["pareto"] = not any(
+            o["val_challenge_accuracy"] >= m["val_challenge_accuracy"]
+            and o["train_seconds"] <= m["train_seconds"]
+            and (o["val_challenge_accuracy"], o["train_seconds"])
+            != (m["val_challenge_accuracy"], m["train_seconds"])
+            for other, o in models.items() if other != name
+        )
+
+
+# -----------------------------
+# Regression comparison
+# -----------------------------
+def compare(results, baseline, accuracy_tolerance=ACCURACY_TOLERANCE,
+            slowdown_tolerance=SLOWDOWN_TOLERANCE):
+    """Human-readable regressions of `results` relative to `baseline`."""
+    regressions = []
+    for name, current in results["models"].items():
+        reference = baseline.get("models", {}).get(name)
+        if reference is None:
+            continue
+        for key in ("val_challenge_accuracy", "val_original_accuracy"):
+            drop = reference[key] - current[key]
+            if drop > accuracy_tolerance:
+                regressions.append(
+                    f"{name}: {key} {reference[key]:.4f} -> {current[key]:.4f} (-{drop:.4f})"
+                )
+        for key in ("train_seconds", "inference_seconds"):
+            if reference[key] > 0 and current[key] / reference[key] > slowdown_tolerance:
+                regressions.append(
+                    f"{name}: {key} {reference[key]:.4f}s -> {current[key]:.4f}s "
+                    f"({current[key] / reference[key]:.2f}x)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark node classifiers on the challenge split")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--seeds", type=int, default=5)
+    parser.add_argument("--epochs", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=10, help="Timed inference passes per run")
+    add_rank_argument(parser)
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--baseline", help="Compare against this stored results file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"Store the results as the reference ({BASELINE_PATH.name})")
+    parser.add_argument("--accuracy-tolerance", type=float, default=ACCURACY_TOLERANCE)
+    parser.add_argument("--slowdown-tolerance", type=float, default=SLOWDOWN_TOLERANCE)
+    args = parser.parse_args()
+
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    results = {
+        "config": {
+            "data": args.data,
+            "seeds": args.seeds,
+            "epochs": args.epochs,
+            "repeats": args.repeats,
+            "rank": args.rank,
+            "projection": args.projection if args.rank else None,
+        },
+        "environment": {
+            "torch": torch.__version__,
+            "device": str(device),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "models": {},
+    }
+    # One fresh process per model: RSS growth (and the CUDA caching
+    # allocator) would otherwise carry over from the previous models
+    context = multiprocessing.get_context("spawn")
+    for name in args.models:
+        print(f"Benchmarking {name}...")
+        with context.Pool(1) as pool:
+            results["models"][name] = pool.apply(
+                _run_isolated,
+                (name, args.data, args.rank, args.projection, range(args.seeds), args.epochs, args.repeats)
+            )
+    mark_pareto(results["models"])
+
+    # -----------------------------
+    # Report
+    # -----------------------------
+    def peak_mib(nbytes):
+        return "n/a" if nbytes is None else f"{nbytes / 2 ** 20:.1f}"
+
+    print(f"\n{'model':<19}{'challenge':>11}{'original':>10}{'train s':>9}"
+          f"{'infer ms':>10}{'peak MiB':>10}{'params':>10}  pareto")
+    for name, m in results["models"].items():
+        print(f"{name:<19}{m['val_challenge_accuracy']:>7.4f}±{m['val_challenge_accuracy_std']:.2f}"
+              f"{m['val_original_accuracy']:>10.4f}{m['train_seconds']:>9.3f}"
+              f"{m['inference_seconds'] * 1000:>10.2f}{peak_mib(m['peak_memory_bytes']):>10}"
+              f"{m['parameters']:>10}  {'*' if m['pareto'] else ''}")
+
+    for path in filter(None, [args.output, BASELINE_PATH if args.save_baseline else None]):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved results to {path}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.accuracy_tolerance, args.slowdown_tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\n✅ No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,229 @@
+"""
+Cached low-rank projection of the 3,703-wide bag-of-words features.
+
+conv1 of the baseline GCN multiplies the full feature matrix on every
+forward pass. Projecting x once to a few dozen dimensions (randomized
+truncated SVD or a sparse random projection) shrinks conv1 by the same
+factor for every later training and inference run. Projections are cached
+in data/cache/, keyed by a hash of the feature matrix, the method, rank and
+seed, so only the first run pays for the decomposition.
+
+    from feature_projection import project_features
+    data.x = project_features(data.x, rank=64)
+
+Scripts take the same --rank/--projection options through
+add_rank_argument() and load_projected().
+
+Run as a script to compare val_mask_challange accuracy and speed across ranks:
+
+    python starter_code/feature_projection.py --ranks 16 32 64 128 256
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import scipy.sparse as sp
+import torch
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = PROJECT_ROOT / "data" / "cache"
+
+METHODS = ["svd", "random"]
+SVD_ITERATIONS = 4
+
+
+# -----------------------------
+# Feature matrix helpers
+# -----------------------------
+def to_scipy(x):
+    """Features (dense or sparse CSR torch tensor) as a float32 scipy CSR matrix."""
+    if x.layout == torch.sparse_csr:
+        return sp.csr_matrix(
+            (x.values().numpy().astype(np.float32), x.col_indices().numpy(), x.crow_indices().numpy()),
+            shape=tuple(x.shape)
+        )
+    return sp.csr_matrix(x.detach().cpu().numpy().astype(np.float32))
+
+
+def dataset_hash(features):
+    """SHA-256 of a scipy CSR feature matrix (shape, structure and values)."""
+    features = features.tocsr()
+    features.sort_indices()
+    digest = hashlib.sha256()
+    digest.update(np.asarray(features.shape, dtype=np.int64).tobytes())
+    for array in (features.indptr.astype(np.int64), features.indices.astype(np.int64),
+                  features.data.astype(np.float32)):
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+# -----------------------------
+# Projections
+# -----------------------------
+def svd_projection(features, rank, seed=0):
+    """Rank-r randomized truncated SVD scores U * S (Halko et al.)."""
+    from sklearn.utils.extmath import randomized_svd
+    u, s, _ = randomized_svd(features, rank, n_iter=SVD_ITERATIONS, random_state=seed)
+    return (u * s).astype(np.float32)
+
+
+def random_projection(features, rank, seed=0):
+    """Sparse (Achlioptas / Li) random projection to `rank` dimensions."""
+    from sklearn.random_projection import SparseRandomProjection
+    projection = SparseRandomProjection(n_components=rank, dense_output=True, random_state=seed)
+    return np.asarray(projection.fit_transform(features), dtype=np.float32)
+
+
+PROJECTIONS = {
+    "svd": svd_projection,
+    "random": random_projection,
+}
+
+
+def save_cached(path, array=None, **arrays):
+    """
+    Save `array` (.npy) or the named `arrays` (.npz) to `path` in the cache.
+    Written to a temporary file and renamed, so a concurrent reader never
+    sees a partial file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        if arrays:
+            np.savez(f, **arrays)
+        else:
+            np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+def cache_path(digest, method, rank, seed, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f"{digest[:16]}-{method}-r{rank}-s{seed}.npy"
+
+
+def project_features(x, rank, method="svd", seed=0, cache_dir=CACHE_DIR, use_cache=True):
+    """
+    Rank-`rank` projection of the node features `x` as a float tensor of
+    shape (num_nodes, rank), loaded from the cache when available.
+    """
+    features = to_scipy(x)
+    path = cache_path(dataset_hash(features), method, rank, seed, cache_dir)
+
+    if use_cache and path.exists():
+        return torch.from_numpy(np.load(path))
+
+    projected = PROJECTIONS[method](features, rank, seed)
+
+    if use_cache:
+        save_cached(path, projected)
+
+    return torch.from_numpy(projected)
+
+
+def add_rank_argument(parser):
+    """The --rank/--projection options read by load_projected()."""
+    parser.add_argument("--rank", type=int,
+                        help="Use a cached rank-r projection of the features (see feature_projection.py)")
+    parser.add_argument("--projection", choices=METHODS, default="svd")
+
+
+def load_projected(path, rank=None, method="svd"):
+    """load_data(path), with data.x replaced by its rank-`rank` projection if given."""
+    from baseline import load_data
+
+    data = load_data(path)
+    if rank:
+        data.x = project_features(data.x, rank, method=method)
+    return data
+
+
+# -----------------------------
+# Rank sweep
+# -----------------------------
+def run(data, x, seeds, epochs, device):
+    """Train the baseline on `x`; mean/std accuracy and timings over seeds."""
+    from baseline import GCN, evaluate, predict, train
+
+    num_classes = int(data.y.max().item() + 1)
+    x = x.to(device)
+    accuracies, train_seconds, inference_seconds = [], [], []
+    for seed in seeds:
+        torch.manual_seed(seed)
+        model = GCN(x.size(1), 16, num_classes).to(device)
+
+        start = time.perf_counter()
+        train(model, data, x=x, epochs=epochs, verbose=False)
+        train_seconds.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        predict(model, data, x)
+        inference_seconds.append(time.perf_counter() - start)
+
+        accuracies.append(evaluate(model, data, x)["challenge"])
+
+    return {
+        "val_challenge_accuracy": float(np.mean(accuracies)),
+        "val_challenge_accuracy_std": float(np.std(accuracies)),
+        "train_seconds": float(np.mean(train_seconds)),
+        "inference_seconds": float(np.mean(inference_seconds)),
+        "conv1_parameters": x.size(1) * 16 + 16,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accuracy/speed of the baseline GCN across feature ranks")
+    parser.add_argument("--data", default="data/citeseer_challenge_public.pt")
+    parser.add_argument("--ranks", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--methods", nargs="+", choices=METHODS, default=METHODS)
+    parser.add_argument("--seeds", type=int, default=5, help="Training seeds per setting")
+    parser.add_argument("--epochs", type=int, default=100)
+    parser.add_argument("--cache-dir", default=str(CACHE_DIR))
+    parser.add_argument("--output", help="Write the results as JSON")
+    args = parser.parse_args()
+
+    from baseline import load_data
+
+    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    data = load_data(args.data)
+    x = data.x
+    data = data.to(device)
+    seeds = range(args.seeds)
+
+    results = [dict(method="full", rank=x.size(1), project_seconds=0.0, cached_seconds=0.0,
+                    **run(data, x, seeds, args.epochs, device))]
+    for method in args.methods:
+        for rank in args.ranks:
+            start = time.perf_counter()
+            project_features(x, rank, method, use_cache=False)
+            project_seconds = time.perf_counter() - start
+
+            project_features(x, rank, method, cache_dir=args.cache_dir)
+            start = time.perf_counter()
+            projected = project_features(x, rank, method, cache_dir=args.cache_dir)
+            cached_seconds = time.perf_counter() - start
+
+            results.append(dict(method=method, rank=rank, project_seconds=project_seconds,
+                                cached_seconds=cached_seconds,
+                                **run(data, projected, seeds, args.epochs, device)))
+
+    print(f"{'method':<8}{'rank':>6}{'val acc':>10}{'± std':>8}{'project s':>11}"
+          f"{'cached s':>10}{'train s':>9}{'infer ms':>10}{'conv1 params':>14}")
+    for r in results:
+        print(f"{r['method']:<8}{r['rank']:>6}{r['val_challenge_accuracy']:>10.4f}"
+              f"{r['val_challenge_accuracy_std']:>8.4f}{r['project_seconds']:>11.3f}"
+              f"{r['cached_seconds']:>10.3f}{r['train_seconds']:>9.3f}"
+              f"{r['inference_seconds'] * 1000:>10.2f}{r['conv1_parameters']:>14}")
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
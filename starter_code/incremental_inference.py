@@ -0,0 +1,367 @@
+"""
+Incremental inference for the baseline GCN on a growing citation graph.
+
+A full `model(x, edge_index)` touches every node. IncrementalGCN instead
+caches every layer's linear output (Z_l = H_l W_l) and aggregated output for
+a trained model, and on each update recomputes only the rows inside the
+affected receptive field:
+
+    A_0 = nodes whose features changed (including new nodes)
+    D   = endpoints of added/removed edges (their degree, and hence the
+          normalization of every edge touching them, changed)
+    A_l = N[D] ∪ N[A_{l-1}]          (N[.] = closed neighborhood)
+
+Layer l recomputes Z_l for A_{l-1} and the aggregation for A_l, so the
+update cost scales with the size of the change times the local degree, not
+with the size of the graph.
+
+The adjacency is a CSR base plus a small delta overlay of added/removed
+edges, folded into the base once it grows past a fraction of the base.
+Edges are treated as undirected (the public edge_index is symmetric).
+Removed nodes keep their index and become isolated.
+
+    engine = IncrementalGCN(model, data.x, data.edge_index)
+    engine.update(add_edges=torch.tensor([[0], [42]]))
+    preds = engine.logits.argmax(dim=1)
+
+Run as a script to check incremental results against full recomputes:
+
+    python starter_code/incremental_inference.py --updates 20
+"""
+import argparse
+import time
+
+import numpy as np
+import scipy.sparse as sp
+import torch
+import torch.nn.functional as F
+
+COMPACT_FRACTION = 0.05  # fold the overlay into the base beyond 5% of its edges
+
+
+def _keys(targets, sources):
+    """Encode directed pairs as sortable int64 keys (target-major)."""
+    return (np.asarray(targets, dtype=np.int64) << 32) | np.asarray(sources, dtype=np.int64)
+
+
+def _split_keys(keys):
+    return keys >> 32, keys & 0xFFFFFFFF
+
+
+def _isin_sorted(values, sorted_keys):
+    """Vectorized membership test against a sorted key array."""
+    if not len(sorted_keys):
+        return np.zeros(len(values), dtype=np.bool_)
+    position = np.minimum(np.searchsorted(sorted_keys, values), len(sorted_keys) - 1)
+    return sorted_keys[position] == values
+
+
+def _to_numpy(index):
+    if index is None:
+        return np.empty((2, 0), dtype=np.int64)
+    if torch.is_tensor(index):
+        index = index.cpu().numpy()
+    return np.asarray(index, dtype=np.int64).reshape(2, -1)
+
+
+class IncrementalGCN:
+    """Cached per-layer state of a trained baseline GCN (see module docstring)."""
+
+    def __init__(self, model, x, edge_index, compact_fraction=COMPACT_FRACTION):
+        model.eval()
+        self.convs = [model.conv1, model.conv2]
+        self.compact_fraction = compact_fraction
+        self.num_nodes = x.size(0)
+
+        edge_index = _to_numpy(edge_index)
+        keep = edge_index[0] != edge_index[1]
+        self._build_base(np.unique(_keys(edge_index[1][keep], edge_index[0][keep])))
+        self.added = np.empty(0, dtype=np.int64)
+        self.removed = np.empty(0, dtype=np.int64)
+
+        # Node-indexed buffers grow geometrically; views cover [:num_nodes]
+        self._x = x.detach().clone()
+        self._deg = np.diff(self.base.indptr).astype(np.float64) + 1  # + self loop
+        self._z = [None] * len(self.convs)
+        self._out = [None] * len(self.convs)
+        self._initialize()
+
+    # -----------------------------
+    # Adjacency: CSR base + delta overlay
+    # -----------------------------
+    def _build_base(self, keys):
+        targets, sources = _split_keys(keys)
+        self.base_keys = keys
+        self.base = sp.csr_matrix(
+            (np.ones(len(keys), dtype=np.bool_), (targets, sources)),
+            shape=(self.num_nodes, self.num_nodes)
+        )
+
+    def _has_edges(self, keys):
+        in_base = _isin_sorted(keys, self.base_keys) & ~_isin_sorted(keys, self.removed)
+        return in_base | _isin_sorted(keys, self.added)
+
+    def _neighbors(self, rows):
+        """(position in `rows`, neighbor) pairs for sorted unique `rows`."""
+        in_base = rows < self.base.shape[0]
+        sub = self.base[rows[in_base]]
+        position = np.repeat(np.flatnonzero(in_base), np.diff(sub.indptr))
+        neighbors = sub.indices.astype(np.int64)
+
+        if len(self.removed):
+            keep = ~_isin_sorted(_keys(rows[position], neighbors), self.removed)
+            position, neighbors = position[keep], neighbors[keep]
+
+        if len(self.added):
+            targets, sources = _split_keys(self.added)
+            hit = _isin_sorted(targets, rows)
+            position = np.concatenate([position, np.searchsorted(rows, targets[hit])])
+            neighbors = np.concatenate([neighbors, sources[hit]])
+
+        return position, neighbors
+
+    def _closed_neighborhood(self, nodes):
+        nodes = np.unique(nodes)
+        if not nodes.size:
+            return nodes
+        _, neighbors = self._neighbors(nodes)
+        return np.union1d(nodes, neighbors)
+
+    def _apply_edge_changes(self, add, remove):
+        """Update the overlay and degrees; returns the nodes whose degree changed."""
+        touched = []
+        for pairs, sign in ((remove, -1), (add, 1)):
+            pairs = pairs[:, pairs[0] != pairs[1]]
+            keys = np.unique(np.concatenate([_keys(pairs[0], pairs[1]), _keys(pairs[1], pairs[0])]))
+            # Adding an existing edge or removing a missing one is a no-op
+            keys = keys[self._has_edges(keys) != (sign > 0)]
+            if not keys.size:
+                continue
+
+            if sign > 0:
+                undo = _isin_sorted(keys, self.removed)
+                self.removed = np.setdiff1d(self.removed, keys[undo], assume_unique=True)
+                self.added = np.union1d(self.added, keys[~undo])
+            else:
+                undo = _isin_sorted(keys, self.added)
+                self.added = np.setdiff1d(self.added, keys[undo], assume_unique=True)
+                self.removed = np.union1d(self.removed, keys[~undo])
+
+            targets, _ = _split_keys(keys)
+            np.add.at(self._deg, targets, sign)
+            touched.append(targets)
+
+        if len(self.added) + len(self.removed) > self.compact_fraction * max(len(self.base_keys), 1):
+            self.compact()
+        return np.unique(np.concatenate(touched)) if touched else np.empty(0, dtype=np.int64)
+
+    def compact(self):
+        """Fold the overlay into the CSR base."""
+        keys = np.setdiff1d(self.base_keys, self.removed, assume_unique=True)
+        self._build_base(np.union1d(keys, self.added))
+        self.added = np.empty(0, dtype=np.int64)
+        self.removed = np.empty(0, dtype=np.int64)
+
+    def edge_index(self):
+        """Current (symmetric) edge_index, e.g. for a full recompute."""
+        keys = np.setdiff1d(self.base_keys, self.removed, assume_unique=True)
+        targets, sources = _split_keys(np.union1d(keys, self.added))
+        return torch.from_numpy(np.stack([sources, targets]))
+
+    # -----------------------------
+    # Cached layers
+    # -----------------------------
+    @property
+    def x(self):
+        return self._x[:self.num_nodes]
+
+    @property
+    def logits(self):
+        return self._out[-1][:self.num_nodes]
+
+    def _reserve(self, num_nodes):
+        """Grow node-indexed buffers (doubling) to hold `num_nodes` rows."""
+        capacity = self._x.size(0)
+        if num_nodes <= capacity:
+            return
+        capacity = max(num_nodes, 2 * capacity)
+
+        def grow(tensor):
+            grown = tensor.new_zeros((capacity,) + tuple(tensor.shape[1:]))
+            grown[:tensor.size(0)] = tensor
+            return grown
+
+        self._x = grow(self._x)
+        self._z = [grow(z) for z in self._z]
+        self._out = [grow(out) for out in self._out]
+        self._deg = np.concatenate([self._deg, np.ones(capacity - len(self._deg))])
+
+    def _layer_input(self, layer, rows):
+        if layer == 0:
+            return self._x[rows]
+        return F.relu(self._out[layer - 1][rows])
+
+    def _aggregate(self, layer, rows):
+        """GCN aggregation D^-1/2 (A + I) D^-1/2 Z (+ bias) for `rows`."""
+        position, neighbors = self._neighbors(rows)
+        position = np.concatenate([position, np.arange(len(rows))])
+        neighbors = np.concatenate([neighbors, rows])
+
+        deg_inv_sqrt = self._deg ** -0.5
+        norm = torch.from_numpy(
+            (deg_inv_sqrt[rows[position]] * deg_inv_sqrt[neighbors]).astype(np.float32)
+        )
+        z = self._z[layer]
+        out = z.new_zeros((len(rows), z.size(1)))
+        out.index_add_(0, torch.from_numpy(position), z[torch.from_numpy(neighbors)] * norm[:, None])
+        bias = self.convs[layer].bias
+        return out + bias if bias is not None else out
+
+    @torch.no_grad()
+    def _initialize(self):
+        rows = np.arange(self.num_nodes)
+        for layer, conv in enumerate(self.convs):
+            self._z[layer] = conv.lin(self._layer_input(layer, rows))
+            self._out[layer] = self._aggregate(layer, rows)
+
+    @torch.no_grad()
+    def update(self, add_edges=None, remove_edges=None, new_x=None,
+               changed_nodes=None, changed_x=None, remove_nodes=None):
+        """
+        Apply one batch of graph changes and refresh the affected rows.
+
+        add_edges / remove_edges: [2, k] node pairs (undirected)
+        new_x:                    features of nodes appended as
+                                  num_nodes, num_nodes + 1, ...
+        changed_nodes, changed_x: new features of existing nodes
+        remove_nodes:             nodes whose edges are all removed
+
+        Returns the number of rows recomputed per layer.
+        """
+        changed = [np.empty(0, dtype=np.int64)]
+        remove = _to_numpy(remove_edges)
+
+        if new_x is not None and len(new_x):
+            start = self.num_nodes
+            self._reserve(start + len(new_x))
+            self.num_nodes += len(new_x)
+            self._x[start:self.num_nodes] = new_x
+            changed.append(np.arange(start, self.num_nodes))
+
+        if changed_nodes is not None:
+            changed_nodes = np.asarray(changed_nodes, dtype=np.int64)
+            self._x[torch.from_numpy(changed_nodes)] = changed_x
+            changed.append(changed_nodes)
+
+        if remove_nodes is not None:
+            nodes = np.unique(np.asarray(remove_nodes, dtype=np.int64))
+            position, neighbors = self._neighbors(nodes)
+            remove = np.concatenate([remove, np.stack([nodes[position], neighbors])], axis=1)
+
+        degree_changed = self._apply_edge_changes(_to_numpy(add_edges), remove)
+        renormalized = self._closed_neighborhood(degree_changed)
+
+        active = np.unique(np.concatenate(changed))
+        recomputed = []
+        for layer, conv in enumerate(self.convs):
+            if active.size:
+                index = torch.from_numpy(active)
+                self._z[layer][index] = conv.lin(self._layer_input(layer, index))
+            rows = np.union1d(renormalized, self._closed_neighborhood(active))
+            if rows.size:
+                self._out[layer][torch.from_numpy(rows)] = self._aggregate(layer, rows)
+            recomputed.append(int(rows.size))
+            active = rows
+        return recomputed
+
+
+# -----------------------------
+# Verification against full recomputes
+# -----------------------------
+def random_update(engine, rng, edges, features, nodes):
+    """A random batch of edge, feature and node changes."""
+    n = engine.num_nodes
+    current = engine.edge_index().numpy()
+    drop = rng.choice(current.shape[1], min(edges, current.shape[1]), replace=False)
+    new_nodes = engine.x[torch.from_numpy(rng.integers(0, n, nodes))]
+    attach = np.stack([np.repeat(np.arange(n, n + nodes), 3), rng.integers(0, n, 3 * nodes)])
+    changed_nodes = rng.choice(n, features, replace=False)
+    return {
+        "add_edges": np.concatenate([rng.integers(0, n, (2, edges)), attach], axis=1),
+        "remove_edges": current[:, drop],
+        "new_x": new_nodes,
+        "changed_nodes": changed_nodes,
+        "changed_x": engine.x[torch.from_numpy(rng.permutation(changed_nodes))],
+    }
+
+
+def main():
+    from baseline import DATA_PATH, GCN, train
+    from feature_projection import add_rank_argument, load_projected
+
+    parser = argparse.ArgumentParser(description="Check incremental GCN inference against full recomputes")
+    parser.add_argument("--data", default=DATA_PATH)
+    add_rank_argument(parser)
+    parser.add_argument("--epochs", type=int, default=100)
+    parser.add_argument("--updates", type=int, default=20)
+    parser.add_argument("--edges", type=int, default=10, help="Edges added and removed per update")
+    parser.add_argument("--features", type=int, default=5, help="Feature rows changed per update")
+    parser.add_argument("--nodes", type=int, default=2, help="Nodes added per update")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    torch.manual_seed(args.seed)
+    rng = np.random.default_rng(args.seed)
+    data = load_projected(args.data, args.rank, args.projection)
+
+    model = GCN(data.x.size(1), 16, int(data.y.max().item() + 1))
+    if args.epochs:
+        train(model, data, epochs=args.epochs, verbose=False)
+    model.eval()
+
+    start = time.perf_counter()
+    engine = IncrementalGCN(model, data.x, data.edge_index)
+    print(f"Cached {engine.num_nodes} nodes in {time.perf_counter() - start:.3f}s")
+
+    def full():
+        with torch.no_grad():
+            return model(engine.x, engine.edge_index())
+
+    failures = 0
+    incremental_total = full_total = 0.0
+    print(f"{'update':>6}{'layer rows':>16}{'incr ms':>10}{'full ms':>10}{'max |diff|':>12}{'preds':>8}")
+    for step in range(args.updates + 1):
+        if step:
+            changes = random_update(engine, rng, args.edges, args.features, args.nodes)
+            start = time.perf_counter()
+            rows = engine.update(**changes)
+            incremental = time.perf_counter() - start
+        else:
+            rows, incremental = [engine.num_nodes] * len(engine.convs), 0.0
+
+        start = time.perf_counter()
+        expected = full()
+        full_seconds = time.perf_counter() - start
+
+        diff = (engine.logits - expected).abs().max().item()
+        same = (engine.logits.argmax(1) == expected.argmax(1)).float().mean().item()
+        ok = torch.allclose(engine.logits, expected, rtol=1e-4, atol=1e-5)
+        failures += not ok
+        if step:
+            incremental_total += incremental
+            full_total += full_seconds
+        print(f"{step:>6}{'/'.join(map(str, rows)):>16}{incremental * 1000:>10.2f}"
+              f"{full_seconds * 1000:>10.2f}{diff:>12.2e}{same:>8.2%}{'' if ok else '  ✗'}")
+
+    if args.updates:
+        print(f"\nMean update: {incremental_total / args.updates * 1000:.2f} ms incremental vs "
+              f"{full_total / args.updates * 1000:.2f} ms full recompute")
+    if failures:
+        print(f"❌ {failures} update(s) differ from the full recompute")
+        return 1
+    print("✅ Incremental results match the full recompute")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())